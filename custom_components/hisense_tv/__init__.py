@@ -2,21 +2,56 @@
 import asyncio
 import logging
 
+import voluptuous as vol
+
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers import config_validation as cv
 
-from .const import DOMAIN
+from .capture import async_replay, capture_path
+from .const import (
+    ATTR_CONFIG_ENTRY_ID,
+    ATTR_FILE,
+    ATTR_SETTINGS,
+    ATTR_SPEED,
+    DOMAIN,
+    SERVICE_REPLAY,
+    SERVICE_SET_PICTURE_SETTINGS,
+)
+from .coordinator import HisenseTvCoordinator, async_get_store
 
 _LOGGER = logging.getLogger(__name__)
 
-PLATFORMS = ["media_player", "switch", "sensor"]
+PLATFORMS = ["media_player", "switch", "sensor", "remote", "number", "select"]
+
+REPLAY_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_FILE): cv.string,
+        vol.Optional(ATTR_SPEED, default=1.0): vol.All(
+            vol.Coerce(float), vol.Range(min=0)
+        ),
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+    }
+)
+
+SET_PICTURE_SETTINGS_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_SETTINGS): vol.Schema(
+            {vol.Coerce(int): vol.Any(int, float, cv.string)}
+        ),
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+    }
+)
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
     """Set up HisenseTV from a config entry."""
     _LOGGER.debug("async_setup_entry")
 
-    hass.data[DOMAIN][entry.entry_id] = {}
+    coordinator = HisenseTvCoordinator(hass=hass, entry=entry)
+    await coordinator.async_start()
+    hass.data[DOMAIN][entry.entry_id] = coordinator
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
 
     for platform in PLATFORMS:
         hass.async_create_task(
@@ -26,6 +61,11 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
     return True
 
 
+async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry):
+    """Reload the config entry when its options change."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
 async def async_unload_entry(hass, entry):
     """Unload HisenseTV config entry."""
     _LOGGER.debug("async_unload_entry")
@@ -38,12 +78,77 @@ async def async_unload_entry(hass, entry):
         )
     )
     if unload_ok:
-        hass.data[DOMAIN].pop(entry.entry_id)
+        coordinator = hass.data[DOMAIN].pop(entry.entry_id)
+        coordinator.async_stop()
     return unload_ok
 
 
+async def async_remove_entry(hass, entry):
+    """Remove persisted data of a deleted HisenseTV config entry."""
+    await async_get_store(hass, entry).async_remove()
+
+
 async def async_setup(hass, config):
     """Set up the HisenseTV integration."""
     _LOGGER.debug("async_setup")
     hass.data.setdefault(DOMAIN, {})
+
+    async def async_handle_replay(call):
+        """Replay a capture file into one or all TVs."""
+        path = capture_path(hass, call.data[ATTR_FILE])
+        entry_id = call.data.get(ATTR_CONFIG_ENTRY_ID)
+        # replay into separate coordinators, the live ones stay untouched
+        coordinators = [
+            HisenseTvCoordinator(
+                hass=hass,
+                entry=hass.config_entries.async_get_entry(coordinator_entry_id),
+                replay=True,
+            )
+            for coordinator_entry_id in hass.data[DOMAIN]
+            if entry_id in (None, coordinator_entry_id)
+        ]
+        try:
+            await asyncio.gather(
+                *[
+                    async_replay(hass, coordinator, path, call.data[ATTR_SPEED])
+                    for coordinator in coordinators
+                ]
+            )
+        finally:
+            for coordinator in coordinators:
+                coordinator.async_stop()
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_REPLAY, async_handle_replay, schema=REPLAY_SCHEMA
+    )
+
+    async def async_handle_set_picture_settings(call):
+        """Apply a batch of picture setting changes to one or all TVs."""
+        entry_id = call.data.get(ATTR_CONFIG_ENTRY_ID)
+        coordinators = {
+            coordinator_entry_id: coordinator
+            for coordinator_entry_id, coordinator in hass.data[DOMAIN].items()
+            if entry_id in (None, coordinator_entry_id)
+        }
+        results = await asyncio.gather(
+            *[
+                coordinator.async_set_picture_settings(call.data[ATTR_SETTINGS])
+                for coordinator in coordinators.values()
+            ]
+        )
+        for coordinator_entry_id, result in zip(coordinators, results):
+            missing = [menu_id for menu_id, ack in result.items() if ack is None]
+            if missing:
+                _LOGGER.warning(
+                    "TV %s did not confirm picture settings %s",
+                    coordinator_entry_id,
+                    missing,
+                )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SET_PICTURE_SETTINGS,
+        async_handle_set_picture_settings,
+        schema=SET_PICTURE_SETTINGS_SCHEMA,
+    )
     return True
@@ -0,0 +1,159 @@
+"""Hisense TV command acknowledgement tracking."""
+from collections import Counter, deque
+import logging
+
+from homeassistant.core import callback
+
+from .decode import PictureValueMessage, StateMessage
+
+_LOGGER = logging.getLogger(__name__)
+
+ACK_TIMEOUT = 10
+ACK_WINDOW = 20
+
+
+def match_source(source_id):
+    """Match the sourceswitch broadcast of a source."""
+    source_id = str(source_id)
+    return lambda message: (
+        isinstance(message, StateMessage)
+        and message.statetype == "sourceswitch"
+        and message.sourceid == source_id
+    )
+
+
+def match_channel(channel_num):
+    """Match the livetv broadcast of a channel, any channel if unknown."""
+    if channel_num is None:
+        return match_statetype("livetv")
+    channel_num = str(channel_num)
+    return lambda message: (
+        isinstance(message, StateMessage)
+        and message.statetype == "livetv"
+        and message.channel_num == channel_num
+    )
+
+
+def match_app(name):
+    """Match the app broadcast of an app."""
+    return lambda message: (
+        isinstance(message, StateMessage)
+        and message.statetype == "app"
+        and message.name == name
+    )
+
+
+def match_statetype(*statetypes):
+    """Match any broadcast of the given state types."""
+    return lambda message: (
+        isinstance(message, StateMessage) and message.statetype in statetypes
+    )
+
+
+def match_picture_value(menu_id):
+    """Match the notify_value_changed broadcast of a picture setting."""
+    return lambda message: (
+        isinstance(message, PictureValueMessage)
+        and message.action == "notify_value_changed"
+        and message.menu_id == menu_id
+    )
+
+
+class PendingCommand:
+    """A published command waiting for its confirming broadcast."""
+
+    __slots__ = ("name", "matcher", "started", "future", "timeout_handle")
+
+    def __init__(self, name, matcher, started, future):
+        self.name = name
+        self.matcher = matcher
+        self.started = started
+        self.future = future
+        self.timeout_handle = None
+
+
+class HisenseTvAcks:
+    """Resolve commands as acknowledged or timed out with their latency."""
+
+    def __init__(self, hass, timeout=ACK_TIMEOUT):
+        self._hass = hass
+        self._timeout = timeout
+        self._pending = {}
+        # recorded with or without the instrumentation option
+        self.last_latency = {}
+        self.recent = deque(maxlen=ACK_WINDOW)
+        self.timeouts = Counter()
+
+    @property
+    def stats(self):
+        """Return the latest and recent latencies and the timeouts."""
+        return {
+            "last": self.recent[-1] if self.recent else None,
+            "recent_mean": sum(self.recent) / len(self.recent)
+            if self.recent
+            else None,
+            "recent_max": max(self.recent, default=None),
+            "last_by_command": dict(self.last_latency),
+            "timeouts": dict(self.timeouts),
+        }
+
+    @callback
+    def async_track(self, name, matcher):
+        """Track a command; the future resolves to the latency or None."""
+        previous = self._pending.pop(name, None)
+        if previous is not None:
+            # a newer command of the same kind supersedes an unconfirmed one
+            self._async_finish(previous)
+            previous.future.cancel()
+        loop = self._hass.loop
+        command = PendingCommand(name, matcher, loop.time(), loop.create_future())
+        command.timeout_handle = loop.call_later(
+            self._timeout, self._async_timeout, command
+        )
+        self._pending[name] = command
+        return command.future
+
+    @callback
+    def async_match(self, message):
+        """Acknowledge every pending command confirmed by a broadcast."""
+        if not self._pending:
+            return
+        now = self._hass.loop.time()
+        for command in list(self._pending.values()):
+            if command.matcher(message):
+                self._async_resolve(command, now - command.started)
+
+    @callback
+    def async_stop(self):
+        """Cancel all pending commands."""
+        for command in list(self._pending.values()):
+            self._async_finish(command)
+            command.future.cancel()
+
+    @callback
+    def _async_timeout(self, command):
+        command.timeout_handle = None
+        if self._pending.get(command.name) is command:
+            _LOGGER.debug("command %s not acknowledged", command.name)
+            self._async_resolve(command, None)
+
+    @callback
+    def _async_resolve(self, command, latency):
+        self._async_finish(command)
+        if latency is None:
+            self.timeouts[command.name] += 1
+        else:
+            _LOGGER.debug("command %s acknowledged after %.3f s", command.name, latency)
+            self.last_latency[command.name] = latency
+            self.recent.append(latency)
+        if not command.future.done():
+            command.future.set_result(latency)
+
+    @callback
+    def _async_finish(self, command):
+        if self._pending.get(command.name) is command:
+            del self._pending[command.name]
+        if command.timeout_handle is not None:
+            command.timeout_handle.cancel()
+            command.timeout_handle = None
+
@@ -0,0 +1,24 @@
+"""App catalogue indexed by appId and name."""
+
+
+class AppCatalogue:
+    """Lookup tables of one fetched app list."""
+
+    __slots__ = ("source", "_by_id", "_by_name")
+
+    def __init__(self, apps):
+        self.source = apps
+        self._by_id = {str(app_id): app for app_id, app in apps.items()}
+        self._by_name = {}
+        for app in apps.values():
+            name = app.get("name")
+            if name:
+                self._by_name.setdefault(str(name).casefold(), app)
+
+    def find(self, query):
+        """Return the app with the given appId or case-insensitive name."""
+        query = str(query).strip()
+        app = self._by_id.get(query)
+        if app is None:
+            app = self._by_name.get(query.casefold())
+        return app
@@ -0,0 +1,117 @@
+"""Hisense TV cache for data fetched from the TV."""
+import asyncio
+import logging
+from time import monotonic
+
+from homeassistant.core import callback
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class HisenseTvCache:
+    """TTL cache serving stale entries while they are refreshed in background."""
+
+    def __init__(self, hass, ttl, on_update=None):
+        self._hass = hass
+        self._ttl = ttl
+        self._on_update = on_update
+        self._entries = {}
+        self._inflight = {}
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def stats(self):
+        """Return hit/miss counters."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._entries),
+            "inflight": len(self._inflight),
+        }
+
+    @callback
+    def peek(self, key):
+        """Return the cached value without counting or refreshing."""
+        entry = self._entries.get(key)
+        return entry[1] if entry is not None else None
+
+    async def async_get(self, key, fetch):
+        """Return the cached value or await fetch() on a miss."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            _LOGGER.debug("cache miss %s (%d/%d)", key, self.hits, self.misses)
+            return await self.async_refresh(key, fetch)
+
+        self.hits += 1
+        _LOGGER.debug("cache hit %s (%d/%d)", key, self.hits, self.misses)
+        if monotonic() - entry[0] >= self._ttl:
+            self._async_start_refresh(key, fetch)
+        return entry[1]
+
+    @callback
+    def is_fresh(self, key):
+        """Return True if the key holds a value younger than the TTL."""
+        entry = self._entries.get(key)
+        return entry is not None and monotonic() - entry[0] < self._ttl
+
+    async def async_refresh(self, key, fetch):
+        """Await fetch() and store its result.
+
+        Concurrent refreshes of a key share one in-flight fetch.
+        """
+        return await asyncio.shield(self._async_start_refresh(key, fetch))
+
+    @callback
+    def _async_start_refresh(self, key, fetch):
+        task = self._inflight.get(key)
+        if task is None:
+            task = self._inflight[key] = self._hass.async_create_task(
+                self._async_fetch(key, fetch)
+            )
+        else:
+            _LOGGER.debug("join in-flight fetch %s", key)
+        return task
+
+    async def _async_fetch(self, key, fetch):
+        try:
+            value = await fetch()
+        finally:
+            self._inflight.pop(key, None)
+        if value is not None:
+            self._entries[key] = (monotonic(), value)
+            if self._on_update is not None:
+                self._on_update()
+        return value
+
+    @callback
+    def as_dict(self):
+        """Return all cached values."""
+        return {key: entry[1] for key, entry in self._entries.items()}
+
+    @callback
+    def async_restore(self, values):
+        """Seed the cache with stale values that are refreshed on first read."""
+        for key, value in values.items():
+            self._entries.setdefault(key, (float("-inf"), value))
+
+    @callback
+    def async_expire(self, prefix):
+        """Mark entries as stale so the next read refreshes them."""
+        for key, entry in self._entries.items():
+            if key.startswith(prefix):
+                self._entries[key] = (float("-inf"), entry[1])
+
+    @callback
+    def async_invalidate(self, prefix):
+        """Drop entries so the next read waits for fresh data."""
+        for key in [key for key in self._entries if key.startswith(prefix)]:
+            del self._entries[key]
+
+    @callback
+    def async_stop(self):
+        """Cancel in-flight fetches."""
+        for task in self._inflight.values():
+            task.cancel()
+        self._inflight.clear()
@@ -0,0 +1,151 @@
+"""Hisense TV MQTT traffic capture and replay."""
+import asyncio
+from fnmatch import fnmatch
+import json
+import logging
+import os
+from time import monotonic, time
+
+from homeassistant.core import callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.event import async_call_later
+
+_LOGGER = logging.getLogger(__name__)
+
+CAPTURE_FILE = "hisense_tv_capture_%s.jsonl"
+CAPTURE_FLUSH_DELAY = 5
+REPLAY_BATCH = 500
+
+
+class ReplayMessage:
+    """Minimal stand-in for an MQTT message read from a capture."""
+
+    __slots__ = ("topic", "payload", "qos", "retain")
+
+    def __init__(self, topic, payload, retain):
+        self.topic = topic
+        self.payload = payload
+        self.qos = 0
+        self.retain = retain
+
+
+class HisenseTvCapture:
+    """Append every received message as one JSON line to a capture file."""
+
+    def __init__(self, hass, path):
+        self._hass = hass
+        self._path = path
+        self._buffer = []
+        self._flush_unsub = None
+
+    @callback
+    def async_record(self, name, msg):
+        """Buffer a message; the buffer is written in the executor."""
+        payload = msg.payload
+        if isinstance(payload, bytes):
+            payload = payload.decode("utf-8", "replace")
+        self._buffer.append(
+            json.dumps(
+                {
+                    "ts": time(),
+                    "name": name,
+                    "topic": msg.topic,
+                    "retain": msg.retain,
+                    "payload": payload,
+                },
+                separators=(",", ":"),
+            )
+        )
+        if self._flush_unsub is None:
+            self._flush_unsub = async_call_later(
+                self._hass, CAPTURE_FLUSH_DELAY, self.async_flush
+            )
+
+    async def async_flush(self, _now=None):
+        """Write buffered messages to the capture file."""
+        if self._flush_unsub is not None:
+            self._flush_unsub()
+            self._flush_unsub = None
+        if not self._buffer:
+            return
+        lines, self._buffer = self._buffer, []
+        await self._hass.async_add_executor_job(self._write, lines)
+
+    def _write(self, lines):
+        with open(self._path, "a", encoding="utf-8") as capture:
+            capture.write("\n".join(lines) + "\n")
+
+
+def capture_path(hass, file):
+    """Resolve a capture file given relative to the configuration directory.
+
+    Captures written by this integration are allowed, any other file has to
+    be in a directory of allowlist_external_dirs.
+    """
+    path = os.path.realpath(hass.config.path(file))
+    if os.path.dirname(path) == os.path.realpath(hass.config.path()) and fnmatch(
+        os.path.basename(path), CAPTURE_FILE % "*"
+    ):
+        return path
+    if hass.config.is_allowed_path(path):
+        return path
+    raise HomeAssistantError("Replaying %s is not allowed" % file)
+
+
+def _open(path):
+    return open(path, encoding="utf-8")
+
+
+def _read_batch(capture):
+    records = []
+    for line in capture:
+        if line.strip():
+            records.append(json.loads(line))
+            if len(records) == REPLAY_BATCH:
+                break
+    return records
+
+
+async def async_replay(hass, coordinator, path, speed=1.0):
+    """Feed a capture into the coordinator handlers; speed 0 replays at max speed.
+
+    The capture is read in batches, so only one batch is held in memory.
+    """
+    capture = await hass.async_add_executor_job(_open, path)
+    topics = coordinator.topics.subscribe
+    started = monotonic()
+    first_ts = None
+    count = 0
+    try:
+        while True:
+            records = await hass.async_add_executor_job(_read_batch, capture)
+            if not records:
+                break
+            for record in records:
+                name = record.get("name")
+                if name not in topics:
+                    continue
+                if speed > 0:
+                    if first_ts is None:
+                        first_ts = record["ts"]
+                    delay = (record["ts"] - first_ts) / speed - (
+                        monotonic() - started
+                    )
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                await coordinator.async_handle_message(
+                    name,
+                    ReplayMessage(topics[name], record["payload"], record["retain"]),
+                )
+                count += 1
+    finally:
+        await hass.async_add_executor_job(capture.close)
+    elapsed = monotonic() - started
+    _LOGGER.info(
+        "Replayed %d messages from %s in %.3f s (%.0f msg/s)",
+        count,
+        path,
+        elapsed,
+        count / elapsed if elapsed > 0 else 0,
+    )
+    return count, elapsed
@@ -0,0 +1,118 @@
+"""Compact channel list store and lookup index."""
+from bisect import bisect_left
+import re
+
+PAGE_SIZE = 100
+
+# channel_param values are opaque tokens with separators, e.g. "1:101"
+PARAM_PATTERN = re.compile(r"^\S*[:#&=/|,;_]\S*$")
+
+
+def normalize(name):
+    """Return a lookup key ignoring case, spaces and punctuation."""
+    return "".join(char for char in str(name).casefold() if char.isalnum())
+
+
+def looks_like_param(query):
+    """Return True if a query could be a channel_param, not a name or number."""
+    return PARAM_PATTERN.match(str(query).strip()) is not None
+
+
+class ChannelList:
+    """Column store of one channel list, built once per fetched list."""
+
+    __slots__ = (
+        "source",
+        "names",
+        "nums",
+        "params",
+        "_by_param",
+        "_by_num",
+        "_by_name",
+        "_sorted_keys",
+        "_sorted_positions",
+    )
+
+    def __init__(self, channels):
+        self.source = channels
+        self.names = tuple(item.get("channel_name") for item in channels)
+        self.nums = tuple(item.get("channel_num") for item in channels)
+        self.params = tuple(item.get("channel_param") for item in channels)
+        self._by_param = None
+
+    def __len__(self):
+        return len(self.params)
+
+    @property
+    def pages(self):
+        """Return the number of pages."""
+        return (len(self.params) + PAGE_SIZE - 1) // PAGE_SIZE
+
+    def page(self, index):
+        """Return the range of channel positions on a page."""
+        start = index * PAGE_SIZE
+        return range(start, min(start + PAGE_SIZE, len(self.params)))
+
+    def page_title(self, index):
+        """Return a title naming the first and last channel number of a page."""
+        positions = self.page(index)
+        if not positions:
+            return str(index + 1)
+        first = self.nums[positions[0]] or positions[0] + 1
+        last = self.nums[positions[-1]] or positions[-1] + 1
+        return "%s - %s" % (first, last)
+
+    def _build_index(self):
+        if self._by_param is not None:
+            return
+        by_param = {}
+        by_num = {}
+        by_name = {}
+        for index, param in enumerate(self.params):
+            by_param.setdefault(param, index)
+            if self.nums[index] is not None:
+                by_num.setdefault(str(self.nums[index]), index)
+            key = normalize(self.names[index] or "")
+            if key:
+                by_name.setdefault(key, index)
+        ordered = sorted(by_name.items())
+        self._by_num = by_num
+        self._by_name = by_name
+        self._sorted_keys = [key for key, _ in ordered]
+        self._sorted_positions = [index for _, index in ordered]
+        self._by_param = by_param
+
+    def find(self, query, prefix=False):
+        """Return the position of a channel by param, number or name.
+
+        With prefix the first channel whose name starts with the query is
+        returned if nothing matches exactly.
+        """
+        self._build_index()
+        query = str(query).strip()
+        for table in (self._by_param, self._by_num):
+            index = table.get(query)
+            if index is not None:
+                return index
+        key = normalize(query)
+        if not key:
+            return None
+        index = self._by_name.get(key)
+        if index is None and prefix:
+            matches = self.search(key, limit=1)
+            index = matches[0] if matches else None
+        return index
+
+    def search(self, query, limit=PAGE_SIZE):
+        """Return the positions of channels whose name starts with the query."""
+        self._build_index()
+        key = normalize(query)
+        if not key:
+            return []
+        matches = []
+        start = bisect_left(self._sorted_keys, key)
+        for position in range(start, len(self._sorted_keys)):
+            if len(matches) >= limit or not self._sorted_keys[position].startswith(key):
+                break
+            matches.append(self._sorted_positions[position])
+        return matches
@@ -8,14 +8,24 @@ import voluptuous as vol
 from homeassistant import config_entries
 from homeassistant.components import mqtt
 from homeassistant.const import CONF_IP_ADDRESS, CONF_MAC, CONF_NAME, CONF_PIN
+from homeassistant.core import callback
 from homeassistant.data_entry_flow import FlowResult
 
 from .const import (
+    CONF_CACHE_TTL,
+    CONF_CAPTURE,
+    CONF_FLEET_MODE,
+    CONF_INSTRUMENTATION,
+    CONF_MACROS,
     CONF_MQTT_IN,
     CONF_MQTT_OUT,
+    CONF_VOLUME_DEBOUNCE,
+    CONF_WOL_ADDRESSES,
+    DEFAULT_CACHE_TTL,
     DEFAULT_CLIENT_ID,
     DEFAULT_MQTT_PREFIX,
     DEFAULT_NAME,
+    DEFAULT_VOLUME_DEBOUNCE,
     DOMAIN,
 )
 
@@ -38,6 +48,12 @@ class HisenseTvFlow(config_entries.ConfigFlow, domain=DOMAIN):
         self._unsubscribe_auth = None
         self._unsubscribe_sourcelist = None
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry):
+        """Get the options flow for this handler."""
+        return HisenseTvOptionsFlow(config_entry)
+
     async def _async_pin_needed(self, message):
         _LOGGER.debug("_async_pin_needed")
         self._unsubscribe()
@@ -203,3 +219,51 @@ class HisenseTvFlow(config_entries.ConfigFlow, domain=DOMAIN):
         """Handle import from YAML."""
         _LOGGER.debug("async_step_import")
         return self.async_create_entry(title=data[CONF_NAME], data=data)
+
+
+class HisenseTvOptionsFlow(config_entries.OptionsFlow):
+    """Hisense TV options flow."""
+
+    def __init__(self, config_entry):
+        """Initialize the options flow."""
+        self.config_entry = config_entry
+
+    async def async_step_init(self, user_input=None):
+        """Manage the options."""
+        if user_input is not None:
+            return self.async_create_entry(title="", data=user_input)
+
+        options = self.config_entry.options
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(
+                {
+                    vol.Optional(
+                        CONF_CACHE_TTL,
+                        default=options.get(CONF_CACHE_TTL, DEFAULT_CACHE_TTL),
+                    ): vol.All(int, vol.Range(min=0)),
+                    vol.Optional(
+                        CONF_VOLUME_DEBOUNCE,
+                        default=options.get(
+                            CONF_VOLUME_DEBOUNCE, DEFAULT_VOLUME_DEBOUNCE
+                        ),
+                    ): vol.All(vol.Coerce(float), vol.Range(min=0, max=5)),
+                    vol.Optional(
+                        CONF_MACROS, default=options.get(CONF_MACROS, "")
+                    ): str,
+                    vol.Optional(
+                        CONF_WOL_ADDRESSES, default=options.get(CONF_WOL_ADDRESSES, "")
+                    ): str,
+                    vol.Optional(
+                        CONF_FLEET_MODE, default=options.get(CONF_FLEET_MODE, False)
+                    ): bool,
+                    vol.Optional(
+                        CONF_CAPTURE, default=options.get(CONF_CAPTURE, False)
+                    ): bool,
+                    vol.Optional(
+                        CONF_INSTRUMENTATION,
+                        default=options.get(CONF_INSTRUMENTATION, False),
+                    ): bool,
+                }
+            ),
+        )
@@ -1,10 +1,26 @@
 """Constants for the Hisense TV integration."""
 
 ATTR_CODE = "auth_code"
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+ATTR_FILE = "file"
+ATTR_SETTINGS = "settings"
+ATTR_SPEED = "speed"
+CONF_CACHE_TTL = "cache_ttl"
+CONF_CAPTURE = "capture"
+CONF_FLEET_MODE = "fleet_mode"
+CONF_INSTRUMENTATION = "instrumentation"
+CONF_MACROS = "macros"
 CONF_MQTT_IN = "mqtt_in"
 CONF_MQTT_OUT = "mqtt_out"
+CONF_VOLUME_DEBOUNCE = "volume_debounce"
+CONF_WOL_ADDRESSES = "wol_addresses"
+DATA_FLEET = "hisense_tv_fleet"
 DATA_KEY = "media_player.hisense_tv"
+DEFAULT_CACHE_TTL = 3600
 DEFAULT_CLIENT_ID = "HomeAssistant"
 DEFAULT_MQTT_PREFIX = "hisense"
 DEFAULT_NAME = "Hisense TV"
+DEFAULT_VOLUME_DEBOUNCE = 0.3
 DOMAIN = "hisense_tv"
+SERVICE_REPLAY = "replay"
+SERVICE_SET_PICTURE_SETTINGS = "set_picture_settings"
@@ -0,0 +1,888 @@
+"""Hisense TV MQTT coordinator shared by all entities of a config entry."""
+import asyncio
+from functools import partial
+import json
+import logging
+from time import perf_counter
+
+import wakeonlan
+
+from homeassistant.components import mqtt
+from homeassistant.const import CONF_IP_ADDRESS, CONF_MAC
+from homeassistant.core import callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .ack import (
+    HisenseTvAcks,
+    match_app,
+    match_channel,
+    match_picture_value,
+    match_source,
+    match_statetype,
+)
+from .apps import AppCatalogue
+from .cache import HisenseTvCache
+from .capture import CAPTURE_FILE, HisenseTvCapture
+from .channels import PAGE_SIZE, ChannelList, looks_like_param
+from .const import (
+    CONF_CACHE_TTL,
+    CONF_CAPTURE,
+    CONF_FLEET_MODE,
+    CONF_INSTRUMENTATION,
+    CONF_MQTT_IN,
+    CONF_MQTT_OUT,
+    CONF_VOLUME_DEBOUNCE,
+    CONF_WOL_ADDRESSES,
+    DEFAULT_CACHE_TTL,
+    DEFAULT_CLIENT_ID,
+    DEFAULT_VOLUME_DEBOUNCE,
+    DOMAIN,
+)
+from .decode import (
+    StateMessage,
+    decode_app_list,
+    decode_channel_infos,
+    decode_channel_list,
+    decode_picture_settings,
+    decode_picture_value,
+    decode_sourcelist,
+    decode_state,
+    decode_volume,
+    loads,
+)
+from .fleet import async_get_fleet
+from .helper import HisenseTvRpc
+from .stats import HisenseTvStats
+from .topics import HisenseTvTopics
+from .wol import async_send_magic_packet
+
+_LOGGER = logging.getLogger(__name__)
+
+UPDATE_TURNOFF = "tvsleep"
+UPDATE_STATE = "state"
+UPDATE_VOLUME = "volume"
+UPDATE_SOURCELIST = "sourcelist"
+UPDATE_PICTURESETTINGS = "picturesettings"
+UPDATE_PICTURESETTINGS_VALUE = "picturesettings_value"
+
+CACHE_CHANNEL_PREFIX = "channellist"
+CACHE_CHANNEL_INFOS = "channellistinfo"
+CACHE_CHANNEL_LIST = "channellist/%s"
+CACHE_APP_LIST = "applist"
+
+WARMUP_DELAY = 0.5
+
+WOL_RETRY_DELAY = 0.5
+WOL_TIMEOUT = 30
+PICTURE_PACE = 0.05
+SOURCELIST_RETRY_DELAY = 1
+SOURCELIST_MAX_DELAY = 60
+
+STORAGE_VERSION = 1
+STORAGE_SAVE_DELAY = 10
+
+
+def async_get_store(hass, entry):
+    """Return the store persisting browse data of a config entry."""
+    return Store(hass, STORAGE_VERSION, "%s.%s" % (DOMAIN, entry.entry_id))
+
+
+class HisenseTvState:
+    """Decoded state of a Hisense TV."""
+
+    __slots__ = (
+        "is_on",
+        "volume",
+        "muted",
+        "source_name",
+        "source_id",
+        "source_list",
+        "source_names",
+        "title",
+        "channel_name",
+        "channel_num",
+        "picture_settings",
+    )
+
+    def __init__(self):
+        self.is_on = False
+        self.volume = None
+        self.muted = False
+        self.source_name = None
+        self.source_id = None
+        self.source_list = {"App": {}}
+        self.source_names = ["App"]
+        self.title = None
+        self.channel_name = None
+        self.channel_num = None
+        self.picture_settings = {}
+
+    def set_source_list(self, source_list):
+        """Replace the source list and sort its names once."""
+        self.source_list = source_list
+        self.source_names = sorted(source_list)
+
+
+class HisenseTvCoordinator:
+    """Owns the MQTT subscriptions of one TV and fans out decoded updates."""
+
+    def __init__(self, hass, entry, replay=False):
+        self._hass = hass
+        # a replay coordinator only runs the handlers; it never publishes,
+        # persists or captures anything
+        self._replay = replay
+        self._mqtt_in = entry.data[CONF_MQTT_IN] or ""
+        self._fleet_mode = entry.options.get(CONF_FLEET_MODE, False)
+        self.topics = HisenseTvTopics(
+            entry.data[CONF_MQTT_IN], entry.data[CONF_MQTT_OUT], DEFAULT_CLIENT_ID
+        )
+        self._listeners = []
+        self._picture_listeners = {}
+        self._channel_lists = {}
+        self._app_catalogue = None
+        self._subscriptions = []
+        self.rpc = HisenseTvRpc(hass)
+        self._handlers = {
+            "tvsleep": self._message_received_turnoff,
+            "state": self._message_received_state,
+            "volumechange": self._message_received_volume,
+            "sourcelist": self._message_received_sourcelist,
+            "picturesetting": self._message_received_picturesettings,
+            "picturesetting_value": self._message_received_picturesettings_value,
+            "getchannellistinfo": self.rpc.async_handle_reply,
+            "channellist": self.rpc.async_handle_reply,
+            "applist": self.rpc.async_handle_reply,
+        }
+        self._state_handlers = {
+            "sourceswitch": self._state_sourceswitch,
+            "livetv": self._state_livetv,
+            "remote_launcher": self._state_remote_launcher,
+            "app": self._state_app,
+            "fake_sleep_0": self._state_fake_sleep,
+        }
+        self._capture = None
+        if entry.options.get(CONF_CAPTURE, False) and not replay:
+            self._capture = HisenseTvCapture(
+                hass, hass.config.path(CAPTURE_FILE % entry.entry_id)
+            )
+        self.state = HisenseTvState()
+        self.stats = None
+        if entry.options.get(CONF_INSTRUMENTATION, False):
+            self.stats = HisenseTvStats()
+        # entities of this TV, for their write counters in diagnostics
+        self.entities = []
+        self.acks = HisenseTvAcks(hass)
+        self.cache = HisenseTvCache(
+            hass,
+            entry.options.get(CONF_CACHE_TTL, DEFAULT_CACHE_TTL),
+            on_update=self._async_schedule_save,
+        )
+        self._store = None if replay else async_get_store(hass, entry)
+        self._load_task = None
+        self._warmup_task = None
+        self._source_list_task = None
+        self._volume_debounce = entry.options.get(
+            CONF_VOLUME_DEBOUNCE, DEFAULT_VOLUME_DEBOUNCE
+        )
+        self._volume_unsub = None
+        self._command_lock = asyncio.Lock()
+        self._mac = entry.data[CONF_MAC]
+        addresses = [entry.data.get(CONF_IP_ADDRESS), wakeonlan.BROADCAST_IP]
+        addresses.extend(entry.options.get(CONF_WOL_ADDRESSES, "").split(","))
+        self._wol_addresses = list(
+            dict.fromkeys(a.strip() for a in addresses if a and a.strip())
+        )
+        self._power_on_waiters = []
+
+    @callback
+    def async_add_listener(self, update_callback):
+        """Register a callback invoked with the update type of every message."""
+        self._listeners.append(update_callback)
+
+        @callback
+        def remove_listener():
+            self._listeners.remove(update_callback)
+
+        return remove_listener
+
+    @callback
+    def async_add_picture_listener(self, menu_id, update_callback):
+        """Register a callback invoked when one picture setting changes."""
+        listeners = self._picture_listeners.setdefault(menu_id, [])
+        listeners.append(update_callback)
+
+        @callback
+        def remove_listener():
+            listeners.remove(update_callback)
+
+        return remove_listener
+
+    @callback
+    def _async_notify(self, update_type):
+        for update_callback in list(self._listeners):
+            update_callback(update_type)
+
+    async def async_start(self):
+        """Subscribe to all TV topics."""
+        if self._fleet_mode:
+            routes = {
+                self.topics.subscribe[name]: self._async_dispatch
+                for name in self._handlers
+            }
+            self._subscriptions.append(
+                await async_get_fleet(self._hass).async_register(self._mqtt_in, routes)
+            )
+            return
+
+        for name in self._handlers:
+            self._subscriptions.append(
+                await mqtt.async_subscribe(
+                    self._hass,
+                    self.topics.subscribe[name],
+                    self._async_dispatch,
+                    encoding=None,
+                )
+            )
+
+    async def _async_dispatch(self, msg):
+        name = self.topics.lookup[msg.topic]
+        if self._capture is not None:
+            self._capture.async_record(name, msg)
+        if self.stats is None:
+            await self.async_handle_message(name, msg)
+            return
+        started = perf_counter()
+        await self.async_handle_message(name, msg)
+        self.stats.record_in(name, perf_counter() - started)
+
+    async def async_handle_message(self, name, msg):
+        """Run the handler registered for a topic name."""
+        result = self._handlers[name](msg)
+        if result is not None:
+            await result
+
+    @callback
+    def async_stop(self):
+        """Drop all subscriptions."""
+        while self._subscriptions:
+            self._subscriptions.pop()()
+        self._async_cancel_warmup()
+        if self._source_list_task is not None:
+            self._source_list_task.cancel()
+            self._source_list_task = None
+        if self._volume_unsub is not None:
+            self._volume_unsub()
+            self._volume_unsub = None
+        self.rpc.async_stop()
+        self.acks.async_stop()
+        self.cache.async_stop()
+        if self._capture is not None:
+            self._hass.async_create_task(self._capture.async_flush())
+
+    async def async_turn_on(self):
+        """Wake the TV and wait until one of its messages confirms power on.
+
+        is_on may be stale, e.g. after a restart, so a burst is always sent
+        and only a message received after the request counts. getvolume makes
+        a TV that is already on answer; gettvstate does not return a state.
+        """
+        loop = asyncio.get_running_loop()
+        waiter = loop.create_future()
+        self._power_on_waiters.append(waiter)
+        deadline = loop.time() + WOL_TIMEOUT
+        delay = WOL_RETRY_DELAY
+        try:
+            while True:
+                await async_send_magic_packet(self._mac, self._wol_addresses)
+                await self.async_publish("getvolume", "")
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    raise HomeAssistantError(
+                        "TV %s did not power on within %d seconds"
+                        % (self._mac, WOL_TIMEOUT)
+                    )
+                try:
+                    await asyncio.wait_for(
+                        asyncio.shield(waiter), min(delay, remaining)
+                    )
+                    _LOGGER.debug("power on confirmed")
+                    return
+                except asyncio.TimeoutError:
+                    delay *= 2
+        finally:
+            if waiter in self._power_on_waiters:
+                self._power_on_waiters.remove(waiter)
+
+    @callback
+    def _async_set_on(self, refresh_sources=True):
+        """Mark the TV on, with the power on work done once per OFF->ON change."""
+        # any message confirms a pending turn_on, also when is_on was stale
+        self._async_powered_on()
+        if self.state.is_on:
+            return
+        self.state.is_on = True
+        if self._replay:
+            return
+        self._async_start_warmup()
+        self._hass.async_create_task(self.async_publish("getvolume", ""))
+        if refresh_sources:
+            self.async_refresh_source_list()
+
+    @callback
+    def _async_powered_on(self):
+        while self._power_on_waiters:
+            waiter = self._power_on_waiters.pop()
+            if not waiter.done():
+                waiter.set_result(None)
+
+    async def _async_send(self, commands, delay_secs=0):
+        """Publish (name, payload, ack) commands as one sequence.
+
+        Every command of the TV goes through here, so sequences never
+        interleave. ack is None or the (name, matcher) of the state broadcast
+        confirming the command; the tracked acknowledgements are returned.
+        """
+        acks = []
+        async with self._command_lock:
+            for index, (name, payload, ack) in enumerate(commands):
+                if index and delay_secs:
+                    await asyncio.sleep(delay_secs)
+                acks.append(None if ack is None else self.acks.async_track(*ack))
+                await self.async_publish(name, payload)
+        return acks
+
+    async def async_send_keys(self, keys, delay_secs=0):
+        """Send remote keys as one sequence that other commands cannot interleave."""
+        await self._async_send([("sendkey", key, None) for key in keys], delay_secs)
+
+    async def async_command(self, name, payload, matcher):
+        """Publish a command and track the state broadcast confirming it."""
+        (ack,) = await self._async_send([(name, payload, (name, matcher))])
+        return ack
+
+    async def async_turn_off(self):
+        """Send KEY_POWER and track the sleep broadcast confirming it."""
+        (ack,) = await self._async_send(
+            [
+                (
+                    "sendkey",
+                    "KEY_POWER",
+                    ("turnoff", match_statetype("tvsleep", "fake_sleep_0")),
+                )
+            ]
+        )
+        return ack
+
+    async def async_select_source(self, source):
+        """Switch to a source of the source list."""
+        if source == "App":
+            (ack,) = await self._async_send(
+                [
+                    (
+                        "sendkey",
+                        "KEY_HOME",
+                        ("changesource", match_statetype("remote_launcher")),
+                    )
+                ]
+            )
+            return ack
+        source_dic = self.state.source_list.get(source, {})
+        payload = json.dumps(
+            {
+                "sourceid": source_dic.get("sourceid"),
+                "sourcename": source_dic.get("sourcename"),
+            }
+        )
+        return await self.async_command(
+            "changesource", payload, match_source(source_dic.get("sourceid"))
+        )
+
+    async def async_change_channel(self, channel_param):
+        """Tune to a channel."""
+        found = self._find_cached_channel(channel_param, prefix=False)
+        channel_num = found[0].nums[found[1]] if found is not None else None
+        return await self.async_command(
+            "changechannel",
+            json.dumps({"channel_param": channel_param}),
+            match_channel(channel_num),
+        )
+
+    async def async_play_channel(self, query):
+        """Tune to a channel given by param, number, name or name prefix."""
+        found = await self.async_find_channel(query)
+        if found is not None:
+            channels, index = found
+            return await self.async_change_channel(channels.params[index])
+        if looks_like_param(query):
+            _LOGGER.debug("channel %s not found, sending it as channel_param", query)
+            return await self.async_change_channel(query)
+        raise HomeAssistantError("Unknown channel %s" % query)
+
+    async def async_launch_app(self, app_id, name, url):
+        """Launch an app."""
+        return await self.async_command(
+            "launchapp",
+            json.dumps({"appId": app_id, "name": name, "url": url}),
+            match_app(name),
+        )
+
+    async def async_set_picture_settings(self, changes):
+        """Apply {menu_id: value} as one paced batch.
+
+        Returns the acknowledgement latency per menu_id, None if a change was
+        not confirmed by its notify_value_changed broadcast.
+        """
+        acks = await self._async_send(
+            [
+                (
+                    "picturesetting",
+                    json.dumps(
+                        {"action": "set_value", "menu_id": menu_id, "menu_value": value}
+                    ),
+                    ("picturesetting_%s" % menu_id, match_picture_value(menu_id)),
+                )
+                for menu_id, value in changes.items()
+            ],
+            PICTURE_PACE,
+        )
+        results = await asyncio.gather(*acks, return_exceptions=True)
+        return {
+            menu_id: latency if isinstance(latency, float) else None
+            for menu_id, latency in zip(changes, results)
+        }
+
+    @callback
+    def async_set_volume(self, volume):
+        """Set the volume optimistically and publish it once changes settle."""
+        self.state.volume = max(0, min(100, volume))
+        if self._volume_unsub is not None:
+            self._volume_unsub()
+        self._volume_unsub = async_call_later(
+            self._hass, self._volume_debounce, self._async_flush_volume
+        )
+        self._async_notify(UPDATE_VOLUME)
+
+    async def async_step_volume(self, step):
+        """Change the volume by step, with key presses while it is unknown."""
+        if self.state.volume is None:
+            key = "KEY_VOLUMEUP" if step > 0 else "KEY_VOLUMEDOWN"
+            await self.async_send_keys([key] * abs(step))
+            return
+        self.async_set_volume(self.state.volume + step)
+
+    async def _async_flush_volume(self, _now):
+        self._volume_unsub = None
+        _LOGGER.debug("flush volume %d", self.state.volume)
+        await self._async_send([("changevolume", self.state.volume, None)])
+
+    @callback
+    def async_refresh_source_list(self):
+        """Request the source list unless a request is already in flight."""
+        if self._source_list_task is None:
+            self._source_list_task = self._hass.async_create_task(
+                self._async_refresh_source_list()
+            )
+
+    async def _async_refresh_source_list(self):
+        delay = SOURCELIST_RETRY_DELAY
+        try:
+            while self.state.is_on:
+                if await self._async_request("sourcelist", decoder=decode_sourcelist):
+                    return
+                _LOGGER.debug("no source list, retry in %d s", delay)
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, SOURCELIST_MAX_DELAY)
+        finally:
+            self._source_list_task = None
+
+    @callback
+    def _async_start_warmup(self):
+        self._async_cancel_warmup()
+        self._warmup_task = self._hass.async_create_task(self._async_warmup())
+
+    @callback
+    def _async_cancel_warmup(self):
+        if self._warmup_task is not None:
+            _LOGGER.debug("cancel warm-up")
+            self._warmup_task.cancel()
+            self._warmup_task = None
+
+    async def _async_warmup(self):
+        """Prefetch browse data after power on, one request at a time."""
+        await self.async_load()
+        _LOGGER.debug("warm-up started")
+        # picture settings are pushed afterwards via notify_value_changed
+        await self._async_request("picturesetting", '{"action": "get_menu_info"}')
+        await asyncio.sleep(WARMUP_DELAY)
+        if not self.cache.is_fresh(CACHE_CHANNEL_INFOS):
+            await self.cache.async_refresh(
+                CACHE_CHANNEL_INFOS, self._async_fetch_channel_infos
+            )
+            await asyncio.sleep(WARMUP_DELAY)
+        channel_infos = self.cache.peek(CACHE_CHANNEL_INFOS) or {}
+        for list_para, item in channel_infos.items():
+            key = CACHE_CHANNEL_LIST % list_para
+            if not self.cache.is_fresh(key):
+                await self.cache.async_refresh(
+                    key,
+                    partial(
+                        self._async_fetch_channel_list, list_para, item.get("list_name")
+                    ),
+                )
+                await asyncio.sleep(WARMUP_DELAY)
+        if not self.cache.is_fresh(CACHE_APP_LIST):
+            await self.cache.async_refresh(CACHE_APP_LIST, self._async_fetch_app_list)
+            await asyncio.sleep(WARMUP_DELAY)
+        _LOGGER.debug("warm-up finished")
+        self._warmup_task = None
+
+    async def async_load(self):
+        """Restore persisted browse data once, shared by all callers."""
+        if self._load_task is None:
+            self._load_task = self._hass.async_create_task(self._async_load())
+        await self._load_task
+
+    async def _async_load(self):
+        if self._store is None:
+            return
+        data = await self._store.async_load()
+        if data is None:
+            return
+        _LOGGER.debug("restoring data saved at %s", data.get("timestamp"))
+        if len(self.state.source_list) <= 1 and data.get("source_list"):
+            self.state.set_source_list(data["source_list"])
+            self._async_notify(UPDATE_SOURCELIST)
+        self.cache.async_restore(data.get("cache", {}))
+
+    @callback
+    def _async_schedule_save(self):
+        if self._store is None:
+            return
+        self._store.async_delay_save(self._data_to_save, STORAGE_SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self):
+        return {
+            "timestamp": dt_util.utcnow().isoformat(),
+            "source_list": self.state.source_list,
+            "cache": self.cache.as_dict(),
+        }
+
+    async def async_publish(self, name, payload):
+        """Publish to a topic of the topic table."""
+        if self._replay:
+            return
+        if self.stats is not None:
+            self.stats.record_out(name)
+        await mqtt.async_publish(
+            hass=self._hass,
+            topic=self.topics.publish[name],
+            payload=payload,
+            retain=False,
+        )
+
+    async def _async_request(self, name, payload="", decoder=loads, match=None):
+        """Request and decode a reply; match filters decoded replies."""
+        if self.stats is not None:
+            self.stats.record_out(name)
+            started = perf_counter()
+        # the reply accepted last, decoded once by the match check
+        decoded = []
+
+        def accept(msg):
+            decoded[:] = [decoder(msg.payload) if msg.payload else None]
+            return decoded[0] is None or match(decoded[0])
+
+        try:
+            msg = await self.rpc.async_request(
+                pub=self.topics.publish[name],
+                sub=self.topics.subscribe[name],
+                payload=payload,
+                match=accept if match is not None else None,
+            )
+        except asyncio.TimeoutError:
+            _LOGGER.debug("timeout error - %s", name)
+            if self.stats is not None:
+                self.stats.record_timeout(name)
+            return None
+        if self.stats is not None:
+            self.stats.record_round_trip(name, perf_counter() - started)
+        if not msg.payload:
+            _LOGGER.debug("Skipping empty reply on %s", name)
+            return None
+        result = decoded[0] if decoded else decoder(msg.payload)
+        if result is None:
+            _LOGGER.warning("Could not decode reply on '%s'", name)
+        return result
+
+    async def async_get_channel_infos(self):
+        """Return the channel lists of the TV keyed by list_para."""
+        return await self.cache.async_get(
+            CACHE_CHANNEL_INFOS, self._async_fetch_channel_infos
+        )
+
+    async def _async_fetch_channel_infos(self):
+        return await self._async_request(
+            "getchannellistinfo", decoder=decode_channel_infos
+        )
+
+    async def async_get_channel_list(self, list_para, list_name):
+        """Return the channels of a channel list."""
+        return await self.cache.async_get(
+            CACHE_CHANNEL_LIST % list_para,
+            partial(self._async_fetch_channel_list, list_para, list_name),
+        )
+
+    async def async_get_channels(self, list_para):
+        """Return the compact store of a channel list, None if unavailable."""
+        channel_infos = await self.async_get_channel_infos() or {}
+        list_name = channel_infos.get(list_para, {}).get("list_name")
+        channels = await self.async_get_channel_list(list_para, list_name)
+        if channels is None:
+            return None
+        return self._compact_channels(list_para, channels)
+
+    @callback
+    def _compact_channels(self, list_para, channels):
+        # rebuilt only for the list that changed
+        compact = self._channel_lists.get(list_para)
+        if compact is None or compact.source is not channels:
+            compact = self._channel_lists[list_para] = ChannelList(channels)
+        return compact
+
+    @callback
+    def _cached_channel_lists(self):
+        lists = []
+        for list_para in self.cache.peek(CACHE_CHANNEL_INFOS) or {}:
+            channels = self.cache.peek(CACHE_CHANNEL_LIST % list_para)
+            if channels is not None:
+                lists.append(self._compact_channels(list_para, channels))
+        return lists
+
+    @callback
+    def _find_cached_channel(self, query, prefix=True):
+        lists = self._cached_channel_lists()
+        for use_prefix in (False, True) if prefix else (False,):
+            for channels in lists:
+                index = channels.find(query, use_prefix)
+                if index is not None:
+                    return channels, index
+        return None
+
+    async def _async_load_first_channel_list(self, refresh=False):
+        # the first list of the TV usually holds all channels; one request at
+        # most besides the list infos, instead of one per list
+        channel_infos = await self.async_get_channel_infos() or {}
+        for list_para, info in channel_infos.items():
+            key = CACHE_CHANNEL_LIST % list_para
+            fetch = partial(
+                self._async_fetch_channel_list, list_para, info.get("list_name")
+            )
+            if refresh:
+                await self.cache.async_refresh(key, fetch)
+            else:
+                await self.cache.async_get(key, fetch)
+            return
+
+    async def async_find_channel(self, query):
+        """Return (ChannelList, position) by param, number, name or name prefix.
+
+        Cached lists are searched first, then the first list is refreshed once.
+        """
+        found = self._find_cached_channel(query)
+        if found is None:
+            _LOGGER.debug("channel %s not cached, refreshing", query)
+            await self._async_load_first_channel_list(refresh=True)
+            found = self._find_cached_channel(query)
+        return found
+
+    async def async_search_channels(self, query, limit=PAGE_SIZE):
+        """Return (ChannelList, position) pairs of channels matching a query."""
+        if not self._cached_channel_lists():
+            await self._async_load_first_channel_list()
+        found = self._find_cached_channel(query, prefix=False)
+        results = [found] if found is not None else []
+        for channels in self._cached_channel_lists():
+            for index in channels.search(query, limit):
+                if len(results) >= limit:
+                    return results
+                if found != (channels, index):
+                    results.append((channels, index))
+        return results
+
+    async def _async_fetch_channel_list(self, list_para, list_name):
+        # a late reply for another list must not be taken for this one
+        reply = await self._async_request(
+            "channellist",
+            json.dumps({"list_para": list_para, "list_name": list_name}),
+            decoder=decode_channel_list,
+            match=lambda reply: reply.list_para in (None, str(list_para)),
+        )
+        return reply.channels if reply is not None else None
+
+    async def async_get_app_list(self):
+        """Return the installed apps keyed by appId."""
+        return await self.cache.async_get(CACHE_APP_LIST, self._async_fetch_app_list)
+
+    async def _async_find_app(self, query, refresh=False):
+        if refresh:
+            apps = await self.cache.async_refresh(
+                CACHE_APP_LIST, self._async_fetch_app_list
+            )
+        else:
+            apps = await self.async_get_app_list()
+        if apps is None:
+            return None
+        if self._app_catalogue is None or self._app_catalogue.source is not apps:
+            self._app_catalogue = AppCatalogue(apps)
+        return self._app_catalogue.find(query)
+
+    async def async_play_app(self, query):
+        """Launch an app given by appId or case-insensitive name."""
+        cached = self.cache.peek(CACHE_APP_LIST) is not None
+        app = await self._async_find_app(query)
+        if app is None and cached:
+            # the app may have been installed after the list was fetched
+            _LOGGER.debug("app %s not in catalogue, refreshing", query)
+            app = await self._async_find_app(query, refresh=True)
+        if app is None:
+            raise HomeAssistantError("Unknown app %s" % query)
+        return await self.async_launch_app(
+            app.get("appId"), app.get("name"), app.get("url")
+        )
+
+    async def _async_fetch_app_list(self):
+        return await self._async_request("applist", decoder=decode_app_list)
+
+    async def _message_received_turnoff(self, msg):
+        """Run when new MQTT message has been received."""
+        _LOGGER.debug("message_received_turnoff")
+        self.state.is_on = False
+        self.acks.async_match(StateMessage("tvsleep"))
+        self._async_cancel_warmup()
+        self._async_notify(UPDATE_TURNOFF)
+
+    async def _message_received_sourcelist(self, msg):
+        """Run when new MQTT message has been received."""
+        if msg.retain:
+            _LOGGER.debug("_message_received_sourcelist - skip retained message")
+            return
+        self.rpc.async_handle_reply(msg)
+        sources = decode_sourcelist(msg.payload)
+        _LOGGER.debug("message_received_sourcelist R(%s):\n%s", msg.retain, sources)
+        if sources:
+            self._async_set_on(refresh_sources=False)
+            sources["App"] = {}
+            self.state.set_source_list(sources)
+            self._async_schedule_save()
+        self._async_notify(UPDATE_SOURCELIST)
+
+    async def _message_received_volume(self, msg):
+        """Run when new MQTT message has been received."""
+        if msg.retain:
+            _LOGGER.debug("_message_received_volume - skip retained message")
+            return
+        _LOGGER.debug("message_received_volume R(%s)\n%s", msg.retain, msg.payload)
+        message = decode_volume(msg.payload)
+        if message is None:
+            return
+        self._async_set_on()
+        if message.volume_type == 0:
+            if self._volume_unsub is None:
+                # keep the optimistic value until the pending change is sent
+                self.state.volume = message.volume_value
+        elif message.volume_type == 2:
+            self.state.muted = message.volume_value == 1
+        self._async_notify(UPDATE_VOLUME)
+
+    async def _message_received_state(self, msg):
+        """Run when new MQTT message has been received."""
+        if msg.retain:
+            _LOGGER.debug("message_received_state - skip retained message")
+            return
+
+        message = decode_state(msg.payload) or StateMessage(None)
+        _LOGGER.debug("message_received_state %s", message.statetype)
+        self.acks.async_match(message)
+
+        if message.statetype != "fake_sleep_0":
+            self._async_set_on()
+        handler = self._state_handlers.get(message.statetype)
+        if handler is not None:
+            handler(message)
+
+        if not self.state.is_on:
+            self._async_cancel_warmup()
+
+        self._async_notify(UPDATE_STATE)
+
+    @callback
+    def _state_sourceswitch(self, message):
+        state = self.state
+        state.source_name = message.sourcename
+        state.source_id = message.sourceid
+        state.title = message.displayname
+        state.channel_name = message.sourcename
+        state.channel_num = None
+        # channel lists depend on the active tuner
+        self.cache.async_expire(CACHE_CHANNEL_PREFIX)
+
+    @callback
+    def _state_livetv(self, message):
+        state = self.state
+        state.source_name = "TV"
+        state.title = message.progname
+        state.channel_name = message.channel_name
+        state.channel_num = message.channel_num
+
+    @callback
+    def _state_remote_launcher(self, message):
+        state = self.state
+        state.source_name = "App"
+        state.title = "Applications"
+        state.channel_name = None
+        state.channel_num = None
+
+    @callback
+    def _state_app(self, message):
+        state = self.state
+        state.source_name = "App"
+        state.title = message.name
+        state.channel_name = message.url
+        state.channel_num = None
+
+    @callback
+    def _state_fake_sleep(self, message):
+        self.state.is_on = False
+
+    async def _message_received_picturesettings(self, msg):
+        """Run when new MQTT message has been received."""
+        self.rpc.async_handle_reply(msg)
+        _LOGGER.debug("_message_received R(%s):\n%s", msg.retain, msg.payload)
+        self._async_set_on()
+        self.state.picture_settings = decode_picture_settings(msg.payload)
+        self._async_notify(UPDATE_PICTURESETTINGS)
+
+    async def _message_received_picturesettings_value(self, msg):
+        """Run when new MQTT message has been received."""
+        _LOGGER.debug("_message_received_value R(%s):\n%s", msg.retain, msg.payload)
+        message = decode_picture_value(msg.payload)
+        self._async_set_on()
+        if message is not None:
+            self.acks.async_match(message)
+        if message is not None and message.action == "notify_value_changed":
+            setting = self.state.picture_settings.get(message.menu_id)
+            if setting is not None:
+                setting.value = message.menu_value
+                for update_callback in list(
+                    self._picture_listeners.get(message.menu_id, ())
+                ):
+                    update_callback()
+            else:
+                _LOGGER.debug(
+                    "_message_received_value menu_id not found: %s", message.menu_id
+                )
+        self._async_notify(UPDATE_PICTURESETTINGS_VALUE)
@@ -0,0 +1,204 @@
+"""Typed decoding of Hisense TV MQTT payloads."""
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+    _loads = orjson.loads
+else:
+    _loads = json.loads
+
+
+def loads(payload):
+    """Parse a str or bytes payload, returning None if it is not valid JSON."""
+    if not payload:
+        return None
+    try:
+        return _loads(payload)
+    except ValueError:
+        return None
+
+
+def _text(value):
+    return value if value is None or isinstance(value, str) else str(value)
+
+
+def _int(value, default=None):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+
+class StateMessage:
+    """A ui_service state broadcast."""
+
+    __slots__ = (
+        "statetype",
+        "sourcename",
+        "sourceid",
+        "displayname",
+        "progname",
+        "channel_name",
+        "channel_num",
+        "name",
+        "url",
+    )
+
+    def __init__(self, statetype, data=None):
+        get = data.get if data is not None else {}.get
+        self.statetype = statetype
+        self.sourcename = _text(get("sourcename"))
+        self.sourceid = _text(get("sourceid"))
+        self.displayname = _text(get("displayname"))
+        self.progname = _text(get("progname"))
+        self.channel_name = _text(get("channel_name"))
+        self.channel_num = _text(get("channel_num"))
+        self.name = _text(get("name"))
+        self.url = _text(get("url"))
+
+
+class VolumeMessage:
+    """A volumechange broadcast; volume_type 0 is the level, 2 is mute."""
+
+    __slots__ = ("volume_type", "volume_value")
+
+    def __init__(self, volume_type, volume_value):
+        self.volume_type = volume_type
+        self.volume_value = volume_value
+
+
+class PictureSetting:
+    """One entry of the picture settings menu."""
+
+    __slots__ = ("menu_id", "name", "value", "options")
+
+    def __init__(self, menu_id, name, value, options=None):
+        self.menu_id = menu_id
+        self.name = name
+        self.value = value
+        self.options = options
+
+
+class PictureValueMessage:
+    """A picture setting value change broadcast."""
+
+    __slots__ = ("action", "menu_id", "menu_value")
+
+    def __init__(self, action, menu_id, menu_value):
+        self.action = action
+        self.menu_id = menu_id
+        self.menu_value = menu_value
+
+
+class ChannelListMessage:
+    """A channellist reply; list_para names the list it answers."""
+
+    __slots__ = ("list_para", "channels")
+
+    def __init__(self, list_para, channels):
+        self.list_para = list_para
+        self.channels = channels
+
+
+def decode_state(payload):
+    """Decode a state broadcast, None if it is not an object."""
+    data = loads(payload)
+    if not isinstance(data, dict):
+        return None
+    return StateMessage(_text(data.get("statetype")), data)
+
+
+def decode_volume(payload):
+    """Decode a volumechange broadcast, None if it is malformed."""
+    data = loads(payload)
+    if not isinstance(data, dict):
+        return None
+    volume_type = _int(data.get("volume_type"))
+    volume_value = _int(data.get("volume_value"))
+    if volume_type is None or volume_value is None:
+        return None
+    return VolumeMessage(volume_type, volume_value)
+
+
+def _objects(data):
+    if not isinstance(data, list):
+        return None
+    return [item for item in data if isinstance(item, dict)]
+
+
+def decode_sourcelist(payload):
+    """Decode a sourcelist reply into source dicts keyed by sourcename."""
+    items = _objects(loads(payload))
+    if items is None:
+        return None
+    return {
+        item["sourcename"]: item
+        for item in items
+        if isinstance(item.get("sourcename"), str)
+    }
+
+
+def decode_picture_settings(payload):
+    """Decode a get_menu_info reply into PictureSetting records by menu_id."""
+    data = loads(payload)
+    if not isinstance(data, dict):
+        return {}
+    settings = {}
+    for item in _objects(data.get("menu_info")) or []:
+        menu_id = _int(item.get("menu_id"))
+        if menu_id is not None:
+            options = item.get("menu_para")
+            if not isinstance(options, list) or not options:
+                options = None
+            else:
+                options = [_text(option) for option in options]
+            settings[menu_id] = PictureSetting(
+                menu_id, _text(item.get("menu_name")), item.get("menu_value"), options
+            )
+    return settings
+
+
+def decode_picture_value(payload):
+    """Decode a picture setting broadcast, None if it is malformed."""
+    data = loads(payload)
+    if not isinstance(data, dict):
+        return None
+    return PictureValueMessage(
+        data.get("action"), _int(data.get("menu_id")), data.get("menu_value")
+    )
+
+
+def decode_channel_infos(payload):
+    """Decode a getchannellistinfo reply keyed by list_para."""
+    items = _objects(loads(payload))
+    if items is None:
+        return None
+    return {
+        item["list_para"]: item for item in items if item.get("list_para") is not None
+    }
+
+
+def decode_channel_list(payload):
+    """Decode a channellist reply, keeping the channel dicts with a param."""
+    data = loads(payload)
+    if not isinstance(data, dict):
+        return None
+    items = _objects(data.get("list"))
+    if items is None:
+        return None
+    return ChannelListMessage(
+        _text(data.get("list_para")),
+        [item for item in items if item.get("channel_param")],
+    )
+
+
+def decode_app_list(payload):
+    """Decode an applist reply keyed by appId."""
+    items = _objects(loads(payload))
+    if items is None:
+        return None
+    return {item["appId"]: item for item in items if item.get("appId") is not None}
@@ -0,0 +1,29 @@
+"""Diagnostics support for Hisense TV."""
+from .const import CONF_FLEET_MODE, DATA_FLEET, DOMAIN
+
+
+async def async_get_config_entry_diagnostics(hass, entry):
+    """Return protocol statistics, cache state and entity state writes."""
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    state = coordinator.state
+    fleet = hass.data.get(DATA_FLEET)
+    return {
+        "options": dict(entry.options),
+        "state": {
+            "is_on": state.is_on,
+            "volume": state.volume,
+            "muted": state.muted,
+            "source_name": state.source_name,
+            "sources": list(state.source_list),
+        },
+        "cache": coordinator.cache.stats,
+        "fleet": fleet.stats
+        if fleet is not None and entry.options.get(CONF_FLEET_MODE)
+        else None,
+        "stats": coordinator.stats.as_dict() if coordinator.stats else None,
+        "acks": coordinator.acks.stats,
+        "entity_writes": {
+            entity.entity_id or entity.unique_id: entity.write_stats
+            for entity in coordinator.entities
+        },
+    }
@@ -0,0 +1,145 @@
+"""Hisense TV fleet mode: shared wildcard subscriptions for many TVs."""
+import asyncio
+import logging
+
+from homeassistant.components import mqtt
+from homeassistant.core import callback
+
+from .const import DATA_FLEET
+
+_LOGGER = logging.getLogger(__name__)
+
+FLEET_TOPIC = "/remoteapp/mobile/#"
+
+
+class TopicTrie:
+    """Topic trie matching concrete topics against registered filters.
+
+    Several handlers may share a filter, e.g. two TVs configured with the
+    same mqtt_in prefix; each one is removed individually.
+    """
+
+    __slots__ = ("_root", "_size")
+
+    def __init__(self):
+        self._root = {}
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def add(self, topic_filter, handler):
+        """Register a handler for a topic filter, which may contain + and #."""
+        node = self._root
+        for level in topic_filter.split("/"):
+            node = node.setdefault(level, {})
+        if None not in node:
+            self._size += 1
+            node[None] = ()
+        node[None] += (handler,)
+
+    def remove(self, topic_filter, handler):
+        """Unregister a handler of a topic filter and prune empty branches."""
+        levels = topic_filter.split("/")
+        path = [self._root]
+        for level in levels:
+            node = path[-1].get(level)
+            if node is None:
+                return
+            path.append(node)
+        handlers = path[-1].get(None, ())
+        if handler not in handlers:
+            return
+        index = handlers.index(handler)
+        handlers = handlers[:index] + handlers[index + 1 :]
+        if handlers:
+            path[-1][None] = handlers
+            return
+        del path[-1][None]
+        self._size -= 1
+        for index in range(len(levels), 0, -1):
+            if path[index]:
+                break
+            del path[index - 1][levels[index - 1]]
+
+    def match(self, topic):
+        """Return the handlers of the most specific matching filter."""
+        return self._match(self._root, topic.split("/"), 0)
+
+    def _match(self, node, levels, index):
+        if index == len(levels):
+            if None in node:
+                return node[None]
+            wildcard = node.get("#")
+            return wildcard.get(None, ()) if wildcard is not None else ()
+        child = node.get(levels[index])
+        if child is not None:
+            handlers = self._match(child, levels, index + 1)
+            if handlers:
+                return handlers
+        child = node.get("+")
+        if child is not None:
+            handlers = self._match(child, levels, index + 1)
+            if handlers:
+                return handlers
+        wildcard = node.get("#")
+        return wildcard.get(None, ()) if wildcard is not None else ()
+
+
+class HisenseTvFleet:
+    """One wildcard subscription per mqtt_in prefix, routed through a trie."""
+
+    def __init__(self, hass):
+        self._hass = hass
+        self._trie = TopicTrie()
+        self._prefixes = {}
+        self._lock = asyncio.Lock()
+
+    @property
+    def stats(self):
+        """Return the number of broker subscriptions and routed topics."""
+        return {"subscriptions": len(self._prefixes), "routes": len(self._trie)}
+
+    async def async_register(self, prefix, routes):
+        """Route {topic: handler} and subscribe to the prefix if needed."""
+        async with self._lock:
+            for topic, handler in routes.items():
+                self._trie.add(topic, handler)
+            if prefix not in self._prefixes:
+                _LOGGER.debug("fleet subscribe %s%s", prefix, FLEET_TOPIC)
+                unsubscribe = await mqtt.async_subscribe(
+                    self._hass,
+                    prefix + FLEET_TOPIC,
+                    self._async_message_received,
+                    encoding=None,
+                )
+                self._prefixes[prefix] = [unsubscribe, 0]
+            self._prefixes[prefix][1] += 1
+
+        @callback
+        def unregister():
+            for topic, handler in routes.items():
+                self._trie.remove(topic, handler)
+            subscription = self._prefixes[prefix]
+            subscription[1] -= 1
+            if subscription[1] == 0:
+                _LOGGER.debug("fleet unsubscribe %s%s", prefix, FLEET_TOPIC)
+                subscription[0]()
+                del self._prefixes[prefix]
+
+        return unregister
+
+    async def _async_message_received(self, msg):
+        for handler in self._trie.match(msg.topic):
+            result = handler(msg)
+            if result is not None:
+                await result
+
+
+@callback
+def async_get_fleet(hass):
+    """Return the fleet router shared by all config entries."""
+    fleet = hass.data.get(DATA_FLEET)
+    if fleet is None:
+        fleet = hass.data[DATA_FLEET] = HisenseTvFleet(hass)
+    return fleet
@@ -1,30 +1,90 @@
 """Hisene TV integration helper methods."""
 import asyncio
+from collections import deque
 import logging
+from time import monotonic
 
 from homeassistant.components import mqtt
 from homeassistant.const import MAJOR_VERSION, MINOR_VERSION
-
-from .const import DEFAULT_CLIENT_ID
+from homeassistant.core import callback
+from homeassistant.helpers.event import async_call_later
 
 _LOGGER = logging.getLogger(__name__)
 
+MIN_WRITE_INTERVAL = 0.25
+
+
+def parse_macros(text):
+    """Parse "name: KEY_A, KEY_B; other: KEY_C" into a dict of key lists."""
+    macros = {}
+    for definition in text.split(";"):
+        name, sep, keys = definition.partition(":")
+        if not sep or not name.strip():
+            continue
+        macros[name.strip()] = [
+            key.strip().upper() for key in keys.split(",") if key.strip()
+        ]
+    return macros
+
 
-async def mqtt_pub_sub(hass, pub, sub, payload=""):
-    """Wrapper for publishing MQTT topics and receive replies on a subscibed topic."""
-    loop = asyncio.get_event_loop()
-    queue = asyncio.Queue()
+class HisenseTvRpc:
+    """Request/response channel on permanently subscribed reply topics.
+
+    Replies are fed in through async_handle_reply by the owner of the
+    subscriptions.
+    """
+
+    def __init__(self, hass):
+        self._hass = hass
+        self._pending = {}
+        self._locks = {}
 
-    def put(*args):
-        loop.call_soon_threadsafe(queue.put_nowait, args)
+    @callback
+    def async_stop(self):
+        """Cancel all pending requests."""
+        for waiters in self._pending.values():
+            for future, _ in waiters:
+                future.cancel()
+        self._pending.clear()
 
-    async def get():
-        while True:
-            yield await asyncio.wait_for(queue.get(), timeout=10)
+    @callback
+    def async_handle_reply(self, msg):
+        """Resolve the oldest request waiting on the message topic."""
+        waiters = self._pending.get(msg.topic)
+        while waiters:
+            future, match = waiters[0]
+            if future.done():
+                waiters.popleft()
+                continue
+            if match is not None and not match(msg):
+                _LOGGER.debug("discard reply of another request on %s", msg.topic)
+                return
+            waiters.popleft()
+            future.set_result(msg)
+            return
+        _LOGGER.debug("unsolicited reply on %s", msg.topic)
 
-    unsubscribe = await mqtt.async_subscribe(hass=hass, topic=sub, msg_callback=put)
-    await mqtt.async_publish(hass=hass, topic=pub, payload=payload)
-    return get(), unsubscribe
+    async def async_request(self, pub, sub, payload="", timeout=10, match=None):
+        """Publish a request and wait for its reply on a subscribed topic.
+
+        Requests sharing a reply topic are sent one at a time. If match is
+        given, replies it rejects, e.g. a late reply to an earlier request
+        that timed out, are discarded instead of resolving this request.
+        """
+        lock = self._locks.get(sub)
+        if lock is None:
+            lock = self._locks[sub] = asyncio.Lock()
+        async with lock:
+            future = self._hass.loop.create_future()
+            waiter = (future, match)
+            waiters = self._pending.setdefault(sub, deque())
+            waiters.append(waiter)
+            try:
+                await mqtt.async_publish(hass=self._hass, topic=pub, payload=payload)
+                return await asyncio.wait_for(future, timeout=timeout)
+            finally:
+                if waiter in waiters:
+                    waiters.remove(waiter)
 
 
 class HisenseTvBase(object):
@@ -33,18 +93,15 @@ class HisenseTvBase(object):
     def __init__(
         self,
         hass,
+        coordinator,
         name: str,
-        mqtt_in: str,
-        mqtt_out: str,
         mac: str,
         uid: str,
         ip_address: str,
     ):
-        self._client = DEFAULT_CLIENT_ID
         self._hass = hass
+        self._coordinator = coordinator
         self._name = name
-        self._mqtt_in = mqtt_in or ""
-        self._mqtt_out = mqtt_out or ""
         self._mac = mac
         self._ip_address = ip_address
         self._unique_id = uid
@@ -53,25 +110,50 @@ class HisenseTvBase(object):
             if MAJOR_VERSION <= 2021 and MINOR_VERSION < 11
             else "mdi:television-shimmer"
         )
-        self._subscriptions = {
-            "tvsleep": lambda: None,
-            "state": lambda: None,
-            "volume": lambda: None,
-            "sourcelist": lambda: None,
-        }
-
-    def _out_topic(self, topic=""):
-        try:
-            out_topic = self._mqtt_out + topic % self._client
-        except:
-            out_topic = self._mqtt_out + topic % self._client
-        _LOGGER.debug("_out_topic: %s", out_topic)
-        return out_topic
-
-    def _in_topic(self, topic=""):
-        try:
-            in_topic = self._mqtt_in + topic % self._client
-        except:
-            in_topic = self._mqtt_in + topic
-        _LOGGER.debug("_in_topic: %s", in_topic)
-        return in_topic
+        self._last_snapshot = None
+        self._last_write = 0
+        self._write_unsub = None
+        self.write_stats = {"written": 0, "unchanged": 0, "throttled": 0}
+        coordinator.entities.append(self)
+
+    def _state_snapshot(self):
+        return (
+            self.available,
+            self.state,
+            self.capability_attributes,
+            self.state_attributes,
+            self.extra_state_attributes,
+        )
+
+    @callback
+    def _async_write_state_throttled(self):
+        """Write the state if it changed, at most once per MIN_WRITE_INTERVAL."""
+        if self._write_unsub is not None:
+            self.write_stats["throttled"] += 1
+            return
+        delay = self._last_write + MIN_WRITE_INTERVAL - monotonic()
+        if delay > 0:
+            self.write_stats["throttled"] += 1
+            self._write_unsub = async_call_later(
+                self._hass, delay, self._async_flush_write
+            )
+            return
+        snapshot = self._state_snapshot()
+        if snapshot == self._last_snapshot:
+            self.write_stats["unchanged"] += 1
+            return
+        self._last_snapshot = snapshot
+        self._last_write = monotonic()
+        self.write_stats["written"] += 1
+        self.async_write_ha_state()
+
+    @callback
+    def _async_flush_write(self, _now):
+        self._write_unsub = None
+        self._async_write_state_throttled()
+
+    @callback
+    def _async_cancel_write(self):
+        if self._write_unsub is not None:
+            self._write_unsub()
+            self._write_unsub = None
@@ -1,13 +1,9 @@
 """Hisense TV media player entity."""
-import asyncio
-import json
-from json.decoder import JSONDecodeError
 import logging
 
 import voluptuous as vol
 import wakeonlan
 
-from homeassistant.components import mqtt
 from homeassistant.components.media_player import (
     DEVICE_CLASS_TV,
     PLATFORM_SCHEMA,
@@ -39,6 +35,7 @@ from homeassistant.const import (
     STATE_OFF,
     STATE_ON,
 )
+from homeassistant.core import callback
 from homeassistant.helpers import config_validation as cv
 
 from .const import (
@@ -48,7 +45,7 @@ from .const import (
     DEFAULT_NAME,
     DOMAIN,
 )
-from .helper import HisenseTvBase, mqtt_pub_sub
+from .helper import HisenseTvBase
 
 REQUIREMENTS = []
 
@@ -105,17 +102,14 @@ async def async_setup_entry(hass, config_entry, async_add_entities):
     name = config_entry.data[CONF_NAME]
     mac = config_entry.data[CONF_MAC]
     ip_address = config_entry.data.get(CONF_IP_ADDRESS, wakeonlan.BROADCAST_IP)
-    mqtt_in = config_entry.data[CONF_MQTT_IN]
-    mqtt_out = config_entry.data[CONF_MQTT_OUT]
     uid = config_entry.unique_id
     if uid is None:
         uid = config_entry.entry_id
 
     entity = HisenseTvEntity(
         hass=hass,
+        coordinator=hass.data[DOMAIN][config_entry.entry_id],
         name=name,
-        mqtt_in=mqtt_in,
-        mqtt_out=mqtt_out,
         mac=mac,
         uid=uid,
         ip_address=ip_address,
@@ -129,9 +123,8 @@ class HisenseTvEntity(MediaPlayerEntity, HisenseTvBase):
     def __init__(
         self,
         hass,
+        coordinator,
         name: str,
-        mqtt_in: str,
-        mqtt_out: str,
         mac: str,
         uid: str,
         ip_address: str,
@@ -139,25 +132,14 @@ class HisenseTvEntity(MediaPlayerEntity, HisenseTvBase):
         HisenseTvBase.__init__(
             self=self,
             hass=hass,
+            coordinator=coordinator,
             name=name,
-            mqtt_in=mqtt_in,
-            mqtt_out=mqtt_out,
             mac=mac,
             uid=uid,
             ip_address=ip_address,
         )
 
-        self._muted = False
-        self._volume = 0
-        self._state = STATE_OFF
-        self._source_name = None
-        self._source_id = None
-        self._source_list = {"App": {}}
-        self._title = None
-        self._channel_name = None
-        self._channel_num = None
-        self._channel_infos = {}
-        self._app_list = {}
+        self._tv = coordinator.state
 
     @property
     def should_poll(self):
@@ -217,295 +199,104 @@ class HisenseTvEntity(MediaPlayerEntity, HisenseTvBase):
     @property
     def state(self):
         """Return the state of the device."""
-        _LOGGER.debug("state %s", self._state)
-        return self._state
+        state = STATE_ON if self._tv.is_on else STATE_OFF
+        _LOGGER.debug("state %s", state)
+        return state
 
     async def async_turn_on(self, **kwargs):
         """Turn the media player on."""
         _LOGGER.debug("turn_on %s (%s)", self._mac, self._ip_address)
-        if (self._ip_address):
-            wakeonlan.send_magic_packet(self._mac, ip_address=self._ip_address)
-        else:
-            wakeonlan.send_magic_packet(self._mac)
-
+        await self._coordinator.async_turn_on()
 
     async def async_turn_off(self, **kwargs):
         """Turn off media player."""
         _LOGGER.debug("turn_off")
-        await mqtt.async_publish(
-            hass=self._hass,
-            topic=self._out_topic("/remoteapp/tv/remote_service/%s/actions/sendkey"),
-            payload="KEY_POWER",
-            retain=False,
-        )
+        await self._coordinator.async_turn_off()
 
     @property
     def is_volume_muted(self):
         """Boolean if volume is currently muted."""
-        _LOGGER.debug("is_volume_muted %s", self._muted)
-        return self._muted
+        _LOGGER.debug("is_volume_muted %s", self._tv.muted)
+        return self._tv.muted
 
     @property
     def volume_level(self):
-        """Volume level of the media player (0..100)."""
-        _LOGGER.debug("volume_level %d", self._volume)
-        return self._volume / 100
+        """Volume level of the media player (0..1), None until reported."""
+        _LOGGER.debug("volume_level %s", self._tv.volume)
+        if self._tv.volume is None:
+            return None
+        return self._tv.volume / 100
 
     async def async_set_volume_level(self, volume):
         """Set volume level, range 0..1."""
         _LOGGER.debug("set_volume_level %s", volume)
-        self._volume = int(volume * 100)
-        await mqtt.async_publish(
-            hass=self._hass,
-            topic=self._out_topic(
-                "/remoteapp/tv/platform_service/%s/actions/changevolume"
-            ),
-            payload=self._volume,
-        )
+        self._coordinator.async_set_volume(int(volume * 100))
 
     async def async_volume_up(self):
         """Volume up the media player."""
         _LOGGER.debug("volume_up")
-        if self._volume < 100:
-            self._volume = self._volume + 1
-        await mqtt.async_publish(
-            hass=self._hass,
-            topic=self._out_topic("/remoteapp/tv/remote_service/%s/actions/sendkey"),
-            payload="KEY_VOLUMEUP",
-        )
+        await self._coordinator.async_step_volume(1)
 
     async def async_volume_down(self):
         """Volume down media player."""
         _LOGGER.debug("volume_down")
-        if self._volume > 0:
-            self._volume = self._volume - 1
-        await mqtt.async_publish(
-            hass=self._hass,
-            topic=self._out_topic("/remoteapp/tv/remote_service/%s/actions/sendkey"),
-            payload="KEY_VOLUMEDOWN",
-        )
+        await self._coordinator.async_step_volume(-1)
 
     async def async_mute_volume(self, mute):
         """Send mute command."""
         _LOGGER.debug("mute_volume %s", mute)
-        self._muted = mute
-        await mqtt.async_publish(
-            hass=self._hass,
-            topic=self._out_topic("/remoteapp/tv/remote_service/%s/actions/sendkey"),
-            payload="KEY_MUTE",
-        )
+        self._tv.muted = mute
+        await self._coordinator.async_send_keys(["KEY_MUTE"])
 
     @property
     def source_list(self):
         """List of available input sources."""
-        _LOGGER.debug("source_list")
-        if len(self._source_list) <= 1:
-            self._hass.async_create_task(
-                mqtt.async_publish(
-                    hass=self._hass,
-                    topic=self._out_topic(
-                        "/remoteapp/tv/ui_service/%s/actions/sourcelist"
-                    ),
-                    payload="0",
-                )
-            )
-        return sorted(list(self._source_list))
+        return self._tv.source_names
 
     @property
     def source(self):
         """Return the current input source."""
         _LOGGER.debug("source")
-        return self._source_name
+        return self._tv.source_name
 
     @property
     def media_title(self):
         """Return the title of current playing media."""
-        if self._state == STATE_OFF:
+        if not self._tv.is_on:
             return None
 
-        _LOGGER.debug("media_title %s", self._title)
-        return self._title
+        _LOGGER.debug("media_title %s", self._tv.title)
+        return self._tv.title
 
     @property
     def media_series_title(self):
         """Return the channel current playing media."""
-        if self._state == STATE_OFF:
+        if not self._tv.is_on:
             return None
 
-        if self._channel_num is not None:
-            channel = "%s (%s)" % (self._channel_name, self._channel_num)
+        if self._tv.channel_num is not None:
+            channel = "%s (%s)" % (self._tv.channel_name, self._tv.channel_num)
         else:
-            channel = self._channel_name
+            channel = self._tv.channel_name
         _LOGGER.debug("media_series_title %s", channel)
         return channel
 
     async def async_select_source(self, source):
         """Select input source."""
         _LOGGER.debug("async_select_source %s", source)
-
-        if source == "App":
-            await mqtt.async_publish(
-                hass=self._hass,
-                topic=self._out_topic(
-                    "/remoteapp/tv/remote_service/%s/actions/sendkey"
-                ),
-                payload="KEY_HOME",
-            )
-            return
-
-        source_dic = self._source_list.get(source)
-        payload = json.dumps(
-            {
-                "sourceid": source_dic.get("sourceid"),
-                "sourcename": source_dic.get("sourcename"),
-            }
-        )
-        await mqtt.async_publish(
-            hass=self._hass,
-            topic=self._out_topic("/remoteapp/tv/ui_service/%s/actions/changesource"),
-            payload=payload,
-        )
-
-    async def async_will_remove_from_hass(self):
-        for unsubscribe in list(self._subscriptions.values()):
-            unsubscribe()
+        await self._coordinator.async_select_source(source)
 
     async def async_added_to_hass(self):
-        """Subscribe to MQTT events."""
-        self._subscriptions["tvsleep"] = await mqtt.async_subscribe(
-            self._hass,
-            self._in_topic(
-                "/remoteapp/mobile/broadcast/platform_service/actions/tvsleep"
-            ),
-            self._message_received_turnoff,
-        )
-
-        self._subscriptions["state"] = await mqtt.async_subscribe(
-            self._hass,
-            self._in_topic("/remoteapp/mobile/broadcast/ui_service/state"),
-            self._message_received_state,
-        )
-
-        self._subscriptions["volume"] = await mqtt.async_subscribe(
-            self._hass,
-            self._in_topic(
-                "/remoteapp/mobile/broadcast/platform_service/actions/volumechange"
-            ),
-            self._message_received_volume,
-        )
-
-        self._subscriptions["sourcelist"] = await mqtt.async_subscribe(
-            self._hass,
-            self._out_topic("/remoteapp/mobile/%s/ui_service/data/sourcelist"),
-            self._message_received_sourcelist,
+        """Register for coordinator updates."""
+        self.async_on_remove(
+            self._coordinator.async_add_listener(self._handle_coordinator_update)
         )
+        self.async_on_remove(self._async_cancel_write)
+        await self._coordinator.async_load()
 
-    async def _message_received_turnoff(self, msg):
-        """Run when new MQTT message has been received."""
-        _LOGGER.debug("message_received_turnoff")
-        self._state = STATE_OFF
-        self.async_write_ha_state()
-
-    async def _message_received_sourcelist(self, msg):
-        """Run when new MQTT message has been received."""
-        if msg.retain:
-            _LOGGER.debug("_message_received_sourcelist - skip retained message")
-            return
-        try:
-            payload = json.loads(msg.payload)
-        except JSONDecodeError:
-            payload = []
-        _LOGGER.debug("message_received_sourcelist R(%s):\n%s", msg.retain, payload)
-        if len(payload) > 0:
-            self._state = STATE_ON
-            self._source_list = {s.get("sourcename"): s for s in payload}
-            self._source_list["App"] = {}
-
-    async def _message_received_volume(self, msg):
-        """Run when new MQTT message has been received."""
-        if msg.retain:
-            _LOGGER.debug("_message_received_volume - skip retained message")
-            return
-        _LOGGER.debug("message_received_volume R(%s)\n%s", msg.retain, msg.payload)
-        try:
-            payload = json.loads(msg.payload)
-            self._state = STATE_ON
-        except JSONDecodeError:
-            payload = {}
-        if payload.get("volume_type") == 0:
-            self._volume = payload.get("volume_value")
-        elif payload.get("volume_type") == 2:
-            self._muted = payload.get("volume_value") == 1
-        self.async_write_ha_state()
-
-    async def _message_received_state(self, msg):
-        """Run when new MQTT message has been received."""
-        if msg.retain:
-            _LOGGER.debug("message_received_state - skip retained message")
-            return
-
-        try:
-            payload = json.loads(msg.payload)
-        except JSONDecodeError:
-            payload = {}
-        statetype = payload.get("statetype")
-        _LOGGER.debug("message_received_state %s", statetype)
-
-        if self._state == STATE_OFF:
-            await mqtt.async_publish(
-                hass=self._hass,
-                topic=self._out_topic(
-                    "/remoteapp/tv/platform_service/%s/actions/getvolume"
-                ),
-                payload="",
-            )
-            await mqtt.async_publish(
-                hass=self._hass,
-                topic=self._out_topic("/remoteapp/tv/ui_service/%s/actions/sourcelist"),
-                payload="",
-            )
-
-        self._state = STATE_ON
-        if statetype == "sourceswitch":
-            # sourceid:
-            # sourcename:
-            # is_signal:
-            # displayname:
-            self._source_name = payload.get("sourcename")
-            self._source_id = payload.get("sourceid")
-            self._title = payload.get("displayname")
-            self._channel_name = payload.get("sourcename")
-            self._channel_num = None
-        elif statetype == "livetv":
-            # progname:
-            # channel_num:
-            # channel_name:
-            # sourceid:
-            # detail:
-            # starttime:
-            # endtime:
-            self._source_name = "TV"
-            self._title = payload.get("progname")
-            self._channel_name = payload.get("channel_name")
-            self._channel_num = payload.get("channel_num")
-        elif statetype == "remote_launcher":
-            self._source_name = "App"
-            self._title = "Applications"
-            self._channel_name = None
-            self._channel_num = None
-        elif statetype == "app":
-            # name:
-            # url:
-            self._source_name = "App"
-            self._title = payload.get("name")
-            self._channel_name = payload.get("url")
-            self._channel_num = None
-        elif statetype == "remote_epg":
-            pass
-        elif statetype == "fake_sleep_0":
-            self._state = STATE_OFF
-
-        self.async_write_ha_state()
+    @callback
+    def _handle_coordinator_update(self, update_type):
+        self._async_write_state_throttled()
 
     async def _build_library_node(self):
         node = BrowseMedia(
@@ -518,47 +309,18 @@ class HisenseTvEntity(MediaPlayerEntity, HisenseTvBase):
             children=[],
         )
 
-        stream_get, unsubscribe_getchannellistinfo = await mqtt_pub_sub(
-            hass=self._hass,
-            pub=self._out_topic(
-                "/remoteapp/tv/platform_service/%s/actions/getchannellistinfo"
-            ),
-            sub=self._in_topic(
-                "/remoteapp/mobile/%s/platform_service/data/getchannellistinfo"
-            ),
-        )
-
-        try:
-            async for msg in stream_get:
-                try:
-                    payload_string = msg[0].payload
-                    if payload_string is None:
-                        _LOGGER.debug("Skipping empty receiver list")
-                        break
-                    payload = json.loads(payload_string)
-                    self._channel_infos = {
-                        item.get("list_para"): item for item in payload
-                    }
-                    for key, item in self._channel_infos.items():
-                        node.children.append(
-                            BrowseMedia(
-                                title=item.get("list_name"),
-                                media_class=MEDIA_CLASS_DIRECTORY,
-                                media_content_type="channellistinfo",
-                                media_content_id=key,
-                                can_play=False,
-                                can_expand=True,
-                            )
-                        )
-                except JSONDecodeError as err:
-                    _LOGGER.warning(
-                        "Could not build Media Library from '%s': %s", msg, err.msg
-                    )
-                break
-        except asyncio.TimeoutError:
-            _LOGGER.debug("timeout error - getchannellistinfo")
-        finally:
-            unsubscribe_getchannellistinfo()
+        channel_infos = await self._coordinator.async_get_channel_infos() or {}
+        for key, item in channel_infos.items():
+            node.children.append(
+                BrowseMedia(
+                    title=item.get("list_name"),
+                    media_class=MEDIA_CLASS_DIRECTORY,
+                    media_content_type="channellistinfo",
+                    media_content_id=key,
+                    can_play=False,
+                    can_expand=True,
+                )
+            )
 
         node.children.append(
             BrowseMedia(
@@ -583,41 +345,18 @@ class HisenseTvEntity(MediaPlayerEntity, HisenseTvBase):
             children=[],
         )
 
-        stream_get, unsubscribe_applist = await mqtt_pub_sub(
-            hass=self._hass,
-            pub=self._out_topic("/remoteapp/tv/ui_service/%s/actions/applist"),
-            sub=self._in_topic("/remoteapp/mobile/%s/ui_service/data/applist"),
-        )
-
-        try:
-            async for msg in stream_get:
-                try:
-                    payload_string = msg[0].payload
-                    if payload_string is None:
-                        _LOGGER.debug("skipping empty app list")
-                        break
-                    payload = json.loads(payload_string)
-                    self._app_list = {item.get("appId"): item for item in payload}
-                    for nid, item in self._app_list.items():
-                        node.children.append(
-                            BrowseMedia(
-                                title=item.get("name"),
-                                media_class=MEDIA_CLASS_APP,
-                                media_content_type=MEDIA_TYPE_APP,
-                                media_content_id=nid,
-                                can_play=True,
-                                can_expand=False,
-                            )
-                        )
-                except JSONDecodeError as err:
-                    _LOGGER.warning(
-                        "Could not build Application list from '%s': %s", msg, err.msg
-                    )
-                break
-        except asyncio.TimeoutError:
-            _LOGGER.debug("timeout error - applist")
-        finally:
-            unsubscribe_applist()
+        app_list = await self._coordinator.async_get_app_list() or {}
+        for nid, item in app_list.items():
+            node.children.append(
+                BrowseMedia(
+                    title=item.get("name"),
+                    media_class=MEDIA_CLASS_APP,
+                    media_content_type=MEDIA_TYPE_APP,
+                    media_content_id=nid,
+                    can_play=True,
+                    can_expand=False,
+                )
+            )
 
         return node
 
@@ -629,81 +368,93 @@ class HisenseTvEntity(MediaPlayerEntity, HisenseTvBase):
         if media_content_id == "app_list":
             return await self._build_app_list_node()
 
-        list_name = self._channel_infos.get(media_content_id).get("list_name")
+        if media_content_type == "channelsearch":
+            return await self._build_channel_search_node(media_content_id)
+        if media_content_type == "channellistpage":
+            list_para, _, page = media_content_id.rpartition("/")
+            return await self._build_channel_page_node(list_para, int(page))
+        return await self._build_channel_list_node(media_content_id)
+
+    async def _build_channel_list_node(self, list_para):
+        channel_infos = await self._coordinator.async_get_channel_infos() or {}
         node = BrowseMedia(
-            title=list_name,
+            title=channel_infos.get(list_para, {}).get("list_name"),
             media_class=MEDIA_CLASS_DIRECTORY,
             media_content_type="channellistinfo",
-            media_content_id=media_content_id,
+            media_content_id=list_para,
             can_play=False,
             can_expand=True,
             children=[],
         )
 
-        channel_info = json.dumps(
-            {"list_para": media_content_id, "list_name": list_name}
-        )
-        stream_get, unsubscribe_channellist = await mqtt_pub_sub(
-            hass=self._hass,
-            pub=self._out_topic(
-                "/remoteapp/tv/platform_service/%s/actions/channellist"
-            ),
-            sub=self._in_topic(
-                "/remoteapp/mobile/%s/platform_service/data/channellist"
-            ),
-            payload=channel_info,
+        channels = await self._coordinator.async_get_channels(list_para)
+        if channels is None:
+            return node
+        if channels.pages <= 1:
+            node.children = self._channel_nodes(channels, range(len(channels)))
+            return node
+        # large line-ups are browsed page by page
+        for page in range(channels.pages):
+            node.children.append(
+                BrowseMedia(
+                    title=channels.page_title(page),
+                    media_class=MEDIA_CLASS_DIRECTORY,
+                    media_content_type="channellistpage",
+                    media_content_id="%s/%d" % (list_para, page),
+                    can_play=False,
+                    can_expand=True,
+                )
+            )
+        return node
+
+    async def _build_channel_page_node(self, list_para, page):
+        channels = await self._coordinator.async_get_channels(list_para)
+        node = BrowseMedia(
+            title=channels.page_title(page) if channels else None,
+            media_class=MEDIA_CLASS_DIRECTORY,
+            media_content_type="channellistpage",
+            media_content_id="%s/%d" % (list_para, page),
+            can_play=False,
+            can_expand=True,
+            children=[],
         )
+        if channels is not None:
+            node.children = self._channel_nodes(channels, channels.page(page))
+        return node
 
-        try:
-            async for msg in stream_get:
-                try:
-                    payload_string = msg[0].payload
-                    if payload_string is None:
-                        _LOGGER.debug("Skipping empty channel list")
-                        break
-                    payload = json.loads(payload_string)
-                    for item in payload.get("list"):
-                        node.children.append(
-                            BrowseMedia(
-                                title=item.get("channel_name"),
-                                media_class=MEDIA_CLASS_CHANNEL,
-                                media_content_type=MEDIA_TYPE_CHANNEL,
-                                media_content_id=item.get("channel_param"),
-                                can_play=True,
-                                can_expand=False,
-                            )
-                        )
-                except JSONDecodeError as err:
-                    _LOGGER.warning(
-                        "Could not build channel list from '%s': %s", msg, err.msg
-                    )
-                break
-        except asyncio.TimeoutError:
-            _LOGGER.debug("timeout error - channellist")
-
-        unsubscribe_channellist()
+    async def _build_channel_search_node(self, query):
+        node = BrowseMedia(
+            title=query,
+            media_class=MEDIA_CLASS_DIRECTORY,
+            media_content_type="channelsearch",
+            media_content_id=query,
+            can_play=False,
+            can_expand=True,
+            children=[],
+        )
+        for channels, index in await self._coordinator.async_search_channels(query):
+            node.children.append(self._channel_node(channels, index))
         return node
 
+    def _channel_nodes(self, channels, positions):
+        return [self._channel_node(channels, index) for index in positions]
+
+    @staticmethod
+    def _channel_node(channels, index):
+        return BrowseMedia(
+            title=channels.names[index],
+            media_class=MEDIA_CLASS_CHANNEL,
+            media_content_type=MEDIA_TYPE_CHANNEL,
+            media_content_id=channels.params[index],
+            can_play=True,
+            can_expand=False,
+        )
+
     async def async_play_media(self, media_type, media_id, **kwargs):
         """Send the play_media command to the media player."""
         _LOGGER.debug("async_play_media %s\n%s", media_id, kwargs)
 
         if media_type == MEDIA_TYPE_CHANNEL:
-            channel = json.dumps({"channel_param": media_id})
-            await mqtt.async_publish(
-                hass=self._hass,
-                topic=self._out_topic(
-                    "/remoteapp/tv/ui_service/%s/actions/changechannel"
-                ),
-                payload=channel,
-            )
+            await self._coordinator.async_play_channel(media_id)
         elif media_type == MEDIA_CLASS_APP:
-            app = self._app_list.get(media_id)
-            payload = json.dumps(
-                {"appId": media_id, "name": app.get("name"), "url": app.get("url")}
-            )
-            await mqtt.async_publish(
-                hass=self._hass,
-                topic=self._out_topic("/remoteapp/tv/ui_service/%s/actions/launchapp"),
-                payload=payload,
-            )
+            await self._coordinator.async_play_app(media_id)
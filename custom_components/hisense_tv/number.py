@@ -0,0 +1,40 @@
+"""Support for numeric picture settings."""
+import logging
+
+from homeassistant.components.number import NumberEntity
+
+from .picture import HisenseTvPictureBase, async_setup_picture_entities, is_numeric
+
+_LOGGER = logging.getLogger(__name__)
+
+
+async def async_setup_entry(hass, config_entry, async_add_entities):
+    """Set up a number entity per numeric picture setting."""
+    _LOGGER.debug("async_setup_entry config: %s", config_entry.data)
+    async_setup_picture_entities(
+        hass, config_entry, async_add_entities, HisenseTvPictureNumber
+    )
+
+
+class HisenseTvPictureNumber(NumberEntity, HisenseTvPictureBase):
+    """Writable numeric picture setting such as backlight or contrast."""
+
+    _attr_min_value = 0
+    _attr_max_value = 100
+    _attr_step = 1
+
+    @staticmethod
+    def supports(setting):
+        """Return True for settings with a numeric value and no options."""
+        return is_numeric(setting)
+
+    @property
+    def value(self):
+        """Return the value of the picture setting."""
+        setting = self._setting
+        return setting.value if setting is not None else None
+
+    async def async_set_value(self, value):
+        """Change the picture setting."""
+        _LOGGER.debug("set picture setting %s to %s", self._menu_id, value)
+        await self._async_set_value(int(value))
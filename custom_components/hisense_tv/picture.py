@@ -0,0 +1,124 @@
+"""Hisense TV picture setting entities."""
+from wakeonlan import BROADCAST_IP
+
+from homeassistant.const import CONF_IP_ADDRESS, CONF_MAC, CONF_NAME
+from homeassistant.core import callback
+
+from .const import DOMAIN
+from .coordinator import UPDATE_PICTURESETTINGS, UPDATE_STATE, UPDATE_TURNOFF
+from .helper import HisenseTvBase
+
+
+def is_numeric(setting):
+    """Return True for settings with a numeric value and no options."""
+    return (
+        setting.options is None
+        and isinstance(setting.value, (int, float))
+        and not isinstance(setting.value, bool)
+    )
+
+
+def has_options(setting):
+    """Return True for settings that report their options."""
+    return setting.options is not None
+
+
+@callback
+def async_setup_picture_entities(hass, config_entry, async_add_entities, factory):
+    """Add an entity per picture setting as soon as menu_info reports it."""
+    coordinator = hass.data[DOMAIN][config_entry.entry_id]
+    uid = config_entry.unique_id
+    if uid is None:
+        uid = config_entry.entry_id
+    entities = {}
+
+    @callback
+    def async_add_picture_entities(update_type):
+        if update_type != UPDATE_PICTURESETTINGS:
+            return
+        new_entities = []
+        for menu_id, setting in coordinator.state.picture_settings.items():
+            if menu_id in entities or not factory.supports(setting):
+                continue
+            entities[menu_id] = factory(
+                hass=hass,
+                coordinator=coordinator,
+                name=config_entry.data[CONF_NAME],
+                mac=config_entry.data[CONF_MAC],
+                uid=uid,
+                ip_address=config_entry.data.get(CONF_IP_ADDRESS, BROADCAST_IP),
+                menu_id=menu_id,
+            )
+            new_entities.append(entities[menu_id])
+        if new_entities:
+            async_add_entities(new_entities)
+
+    config_entry.async_on_unload(
+        coordinator.async_add_listener(async_add_picture_entities)
+    )
+    if coordinator.state.picture_settings:
+        async_add_picture_entities(UPDATE_PICTURESETTINGS)
+
+
+class HisenseTvPictureBase(HisenseTvBase):
+    """Entity bound to one picture setting, written only when it changes."""
+
+    def __init__(self, hass, coordinator, name, mac, uid, ip_address, menu_id):
+        HisenseTvBase.__init__(
+            self=self,
+            hass=hass,
+            coordinator=coordinator,
+            name=name,
+            mac=mac,
+            uid=uid,
+            ip_address=ip_address,
+        )
+        self._tv = coordinator.state
+        self._menu_id = menu_id
+        setting = self._tv.picture_settings.get(menu_id)
+        label = setting.name if setting is not None and setting.name else menu_id
+        self._attr_name = "%s %s" % (name, label)
+        self._attr_unique_id = "%s_picture_%s" % (uid, menu_id)
+        self._attr_icon = "mdi:image-edit"
+
+    @staticmethod
+    def supports(setting):
+        """Return True if the setting can be represented by this entity."""
+        return True
+
+    async def async_added_to_hass(self):
+        self.async_on_remove(
+            self._coordinator.async_add_listener(self._handle_coordinator_update)
+        )
+        self.async_on_remove(
+            self._coordinator.async_add_picture_listener(
+                self._menu_id, self._async_write_state_throttled
+            )
+        )
+        self.async_on_remove(self._async_cancel_write)
+
+    @callback
+    def _handle_coordinator_update(self, update_type):
+        if update_type in (UPDATE_STATE, UPDATE_TURNOFF, UPDATE_PICTURESETTINGS):
+            self._async_write_state_throttled()
+
+    @property
+    def _setting(self):
+        return self._tv.picture_settings.get(self._menu_id)
+
+    async def _async_set_value(self, value):
+        await self._coordinator.async_set_picture_settings({self._menu_id: value})
+
+    @property
+    def should_poll(self):
+        """No polling needed."""
+        return False
+
+    @property
+    def available(self):
+        """Return True if entity is available."""
+        return self._tv.is_on and self._setting is not None
+
+    @property
+    def device_info(self):
+        return {"identifiers": {(DOMAIN, self._unique_id)}}
@@ -0,0 +1,130 @@
+"""Hisense TV remote entity."""
+import logging
+
+import wakeonlan
+
+from homeassistant.components.remote import (
+    ATTR_DELAY_SECS,
+    ATTR_NUM_REPEATS,
+    DEFAULT_DELAY_SECS,
+    DEFAULT_NUM_REPEATS,
+    RemoteEntity,
+)
+from homeassistant.const import CONF_IP_ADDRESS, CONF_MAC, CONF_NAME
+from homeassistant.core import callback
+
+from .const import CONF_MACROS, DEFAULT_NAME, DOMAIN
+from .helper import HisenseTvBase, parse_macros
+
+_LOGGER = logging.getLogger(__name__)
+
+
+async def async_setup_entry(hass, config_entry, async_add_entities):
+    """Set up the remote entry."""
+    _LOGGER.debug("async_setup_entry config: %s", config_entry.data)
+
+    name = config_entry.data[CONF_NAME]
+    mac = config_entry.data[CONF_MAC]
+    ip_address = config_entry.data.get(CONF_IP_ADDRESS, wakeonlan.BROADCAST_IP)
+    uid = config_entry.unique_id
+    if uid is None:
+        uid = config_entry.entry_id
+
+    entity = HisenseTvRemote(
+        hass=hass,
+        coordinator=hass.data[DOMAIN][config_entry.entry_id],
+        name=name,
+        mac=mac,
+        uid=uid,
+        ip_address=ip_address,
+        macros=parse_macros(config_entry.options.get(CONF_MACROS, "")),
+    )
+    async_add_entities([entity])
+
+
+class HisenseTvRemote(RemoteEntity, HisenseTvBase):
+    """Hisense TV remote entity."""
+
+    def __init__(self, hass, coordinator, name, mac, uid, ip_address, macros):
+        HisenseTvBase.__init__(
+            self=self,
+            hass=hass,
+            coordinator=coordinator,
+            name=name,
+            mac=mac,
+            uid=uid,
+            ip_address=ip_address,
+        )
+        self._tv = coordinator.state
+        self._macros = macros
+
+    @property
+    def name(self):
+        return self._name
+
+    @property
+    def icon(self):
+        return "mdi:remote-tv"
+
+    @property
+    def unique_id(self):
+        """Return the unique id of the device."""
+        return self._unique_id
+
+    @property
+    def device_info(self):
+        return {
+            "identifiers": {(DOMAIN, self._unique_id)},
+            "name": self._name,
+            "manufacturer": DEFAULT_NAME,
+        }
+
+    @property
+    def should_poll(self):
+        """No polling needed."""
+        return False
+
+    @property
+    def is_on(self):
+        return self._tv.is_on
+
+    @property
+    def extra_state_attributes(self):
+        """Return the configured macros."""
+        return {"macros": sorted(self._macros)}
+
+    async def async_turn_on(self, **kwargs):
+        """Turn the TV on."""
+        _LOGGER.debug("turn_on %s (%s)", self._mac, self._ip_address)
+        await self._coordinator.async_turn_on()
+
+    async def async_turn_off(self, **kwargs):
+        """Turn the TV off."""
+        await self._coordinator.async_turn_off()
+
+    async def async_send_command(self, command, **kwargs):
+        """Send a paced sequence of keys, macros or channel digits."""
+        num_repeats = kwargs.get(ATTR_NUM_REPEATS, DEFAULT_NUM_REPEATS)
+        delay_secs = kwargs.get(ATTR_DELAY_SECS, DEFAULT_DELAY_SECS)
+
+        keys = []
+        for item in command:
+            if item in self._macros:
+                keys.extend(self._macros[item])
+            elif item.isdigit():
+                keys.extend("KEY_%s" % digit for digit in item)
+            else:
+                key = item.upper()
+                keys.append(key if key.startswith("KEY_") else "KEY_" + key)
+        _LOGGER.debug("send_command %s x%d", keys, num_repeats)
+        await self._coordinator.async_send_keys(keys * num_repeats, delay_secs)
+
+    async def async_added_to_hass(self):
+        self.async_on_remove(
+            self._coordinator.async_add_listener(self._handle_coordinator_update)
+        )
+        self.async_on_remove(self._async_cancel_write)
+
+    @callback
+    def _handle_coordinator_update(self, update_type):
+        self._async_write_state_throttled()
@@ -0,0 +1,50 @@
+"""Support for enumerated picture settings."""
+import logging
+
+from homeassistant.components.select import SelectEntity
+
+from .picture import HisenseTvPictureBase, async_setup_picture_entities, has_options
+
+_LOGGER = logging.getLogger(__name__)
+
+
+async def async_setup_entry(hass, config_entry, async_add_entities):
+    """Set up a select entity per enumerated picture setting."""
+    _LOGGER.debug("async_setup_entry config: %s", config_entry.data)
+    async_setup_picture_entities(
+        hass, config_entry, async_add_entities, HisenseTvPictureSelect
+    )
+
+
+class HisenseTvPictureSelect(SelectEntity, HisenseTvPictureBase):
+    """Writable picture setting with a fixed set of options, e.g. picture mode."""
+
+    @staticmethod
+    def supports(setting):
+        """Return True for settings that report their options."""
+        return has_options(setting)
+
+    @property
+    def options(self):
+        """Return the options reported by the TV."""
+        setting = self._setting
+        return setting.options if setting is not None else []
+
+    @property
+    def current_option(self):
+        """Return the current option; integer values index the options."""
+        setting = self._setting
+        if setting is None:
+            return None
+        if isinstance(setting.value, int) and 0 <= setting.value < len(setting.options):
+            return setting.options[setting.value]
+        return setting.value
+
+    async def async_select_option(self, option):
+        """Change the picture setting."""
+        _LOGGER.debug("set picture setting %s to %s", self._menu_id, option)
+        setting = self._setting
+        if setting is not None and isinstance(setting.value, int):
+            await self._async_set_value(setting.options.index(option))
+        else:
+            await self._async_set_value(option)
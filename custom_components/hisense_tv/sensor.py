@@ -1,20 +1,40 @@
 """Support for Picture Settings sensors."""
-from datetime import timedelta
-import json
-from json.decoder import JSONDecodeError
+from collections import Counter
 import logging
 from wakeonlan import BROADCAST_IP
 
-from homeassistant.components import mqtt
 from homeassistant.components.sensor import SensorEntity
-from homeassistant.const import CONF_IP_ADDRESS, CONF_MAC, CONF_NAME
-from homeassistant.util import dt as dt_util
-
-from .const import CONF_MQTT_IN, CONF_MQTT_OUT, DEFAULT_NAME, DOMAIN
+from homeassistant.const import (
+    CONF_IP_ADDRESS,
+    CONF_MAC,
+    CONF_NAME,
+    ENTITY_CATEGORY_DIAGNOSTIC,
+)
+from homeassistant.core import callback
+
+from .const import DEFAULT_NAME, DOMAIN
 from .helper import HisenseTvBase
+from .picture import (
+    HisenseTvPictureBase,
+    async_setup_picture_entities,
+    has_options,
+    is_numeric,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
+STATS_SENSORS = {
+    "messages_in": ("Messages received", None),
+    "messages_out": ("Messages sent", None),
+    "timeouts": ("Request timeouts", None),
+    "round_trip": ("Request round trip", "ms"),
+    "handler_time": ("Handler time", "ms"),
+}
+ACK_SENSORS = {
+    "command_latency": ("Command latency", "ms"),
+    "unacknowledged": ("Unacknowledged commands", None),
+}
+
 
 async def async_setup_entry(hass, config_entry, async_add_entities):
     """Set up MQTT sensors dynamically through MQTT discovery."""
@@ -23,121 +43,65 @@ async def async_setup_entry(hass, config_entry, async_add_entities):
     name = config_entry.data[CONF_NAME]
     mac = config_entry.data[CONF_MAC]
     ip_address = config_entry.data.get(CONF_IP_ADDRESS, BROADCAST_IP)
-    mqtt_in = config_entry.data[CONF_MQTT_IN]
-    mqtt_out = config_entry.data[CONF_MQTT_OUT]
     uid = config_entry.unique_id
     if uid is None:
         uid = config_entry.entry_id
 
+    coordinator = hass.data[DOMAIN][config_entry.entry_id]
     entity = HisenseTvSensor(
         hass=hass,
+        coordinator=coordinator,
         name=name,
-        mqtt_in=mqtt_in,
-        mqtt_out=mqtt_out,
         mac=mac,
         uid=uid,
         ip_address=ip_address,
     )
-    async_add_entities([entity])
+    entities = [entity]
+    entities.extend(
+        HisenseTvAckSensor(coordinator, name, uid, key) for key in ACK_SENSORS
+    )
+    if coordinator.stats is not None:
+        entities.extend(
+            HisenseTvStatsSensor(coordinator, name, uid, key)
+            for key in STATS_SENSORS
+        )
+    async_add_entities(entities)
+
+    async_setup_picture_entities(
+        hass, config_entry, async_add_entities, HisenseTvPictureSensor
+    )
 
 
 class HisenseTvSensor(SensorEntity, HisenseTvBase):
     """Representation of a sensor that can be updated using MQTT."""
 
-    def __init__(self, hass, name, mqtt_in, mqtt_out, mac, uid, ip_address):
+    def __init__(self, hass, coordinator, name, mac, uid, ip_address):
         HisenseTvBase.__init__(
             self=self,
             hass=hass,
+            coordinator=coordinator,
             name=name,
-            mqtt_in=mqtt_in,
-            mqtt_out=mqtt_out,
             mac=mac,
             uid=uid,
             ip_address=ip_address,
         )
-        self._is_available = False
-        self._state = {}
-        self._last_trigger = dt_util.utcnow()
-        self._force_trigger = False
-
-    async def async_will_remove_from_hass(self):
-        for unsubscribe in list(self._subscriptions.values()):
-            unsubscribe()
+        self._tv = coordinator.state
 
     async def async_added_to_hass(self):
-        self._subscriptions["tvsleep"] = await mqtt.async_subscribe(
-            self._hass,
-            self._in_topic(
-                "/remoteapp/mobile/broadcast/platform_service/actions/tvsleep"
-            ),
-            self._message_received_turnoff,
+        self.async_on_remove(
+            self._coordinator.async_add_listener(self._handle_coordinator_update)
         )
+        self.async_on_remove(self._async_cancel_write)
 
-        self._subscriptions["state"] = await mqtt.async_subscribe(
-            self._hass,
-            self._in_topic("/remoteapp/mobile/broadcast/ui_service/state"),
-            self._message_received_turnon,
-        )
-
-        self._subscriptions["picturesettings"] = await mqtt.async_subscribe(
-            self._hass,
-            self._in_topic("/remoteapp/mobile/%s/platform_service/data/picturesetting"),
-            self._message_received,
-        )
+    @callback
+    def _handle_coordinator_update(self, update_type):
+        _LOGGER.debug("coordinator update %s", update_type)
+        self._async_write_state_throttled()
 
-        self._subscriptions["picturesettings_value"] = await mqtt.async_subscribe(
-            self._hass,
-            self._in_topic(
-                "/remoteapp/mobile/broadcast/platform_service/data/picturesetting"
-            ),
-            self._message_received_value,
-        )
-
-    async def _message_received_turnoff(self, msg):
-        _LOGGER.debug("message_received_turnoff")
-        self._is_available = False
-        self.async_write_ha_state()
-
-    async def _message_received_turnon(self, msg):
-        _LOGGER.debug("message_received_turnon")
-        if msg.retain:
-            _LOGGER.debug("message_received_turnon - skip retained message")
-            return
-
-        self._is_available = True
-        self._force_trigger = True
-        self.async_write_ha_state()
-
-    async def _message_received(self, msg):
-        self._is_available = True
-        try:
-            payload = json.loads(msg.payload)
-        except JSONDecodeError:
-            payload = {}
-        _LOGGER.debug("_message_received R(%s):\n%s", msg.retain, payload)
-        self._state = {
-            s.get("menu_id"): {"name": s.get("menu_name"), "value": s.get("menu_value")}
-            for s in payload.get("menu_info", [])
-        }
-        self.async_write_ha_state()
-
-    async def _message_received_value(self, msg):
-        self._is_available = True
-        self._force_trigger = True
-        try:
-            payload = json.loads(msg.payload)
-        except JSONDecodeError:
-            payload = {}
-        _LOGGER.debug("_message_received_value R(%s):\n%s", msg.retain, payload)
-        if "notify_value_changed" == payload.get("action"):
-            menu_id = payload.get("menu_id")
-            entry = self._state.get(menu_id)
-            if entry is not None:
-                entry["value"] = payload.get("menu_value")
-            else:
-                _LOGGER.debug("_message_received_value menu_id not found: %s", menu_id)
-
-        self.async_write_ha_state()
+    @property
+    def should_poll(self):
+        """No polling needed."""
+        return False
 
     @property
     def name(self):
@@ -147,45 +111,19 @@ class HisenseTvSensor(SensorEntity, HisenseTvBase):
     @property
     def native_value(self):
         """Return the state of the sensor."""
-        return self._state.get(91, {}).get("value", "")
+        setting = self._tv.picture_settings.get(91)
+        return setting.value if setting is not None else ""
 
     @property
     def available(self):
         """Return True if entity is available."""
-        return self._is_available
+        return self._tv.is_on
 
     @property
     def icon(self):
         """Return the icon to use in the frontend, if any."""
         return self._icon
 
-    @property
-    def extra_state_attributes(self):
-        """Return the state attributes of the sensor."""
-        return {v["name"]: v["value"] for k, v in self._state.items()}
-
-    async def async_update(self):
-        """Get the latest data and updates the states."""
-        if (
-            not self._force_trigger
-            and dt_util.utcnow() - self._last_trigger < timedelta(minutes=5)
-        ):
-            _LOGGER.debug("Skip update")
-            return
-
-        _LOGGER.debug("Update. force=%s", self._force_trigger)
-        self._force_trigger = False
-        self._last_trigger = dt_util.utcnow()
-
-        await mqtt.async_publish(
-            hass=self._hass,
-            topic=self._out_topic(
-                "/remoteapp/tv/platform_service/%s/actions/picturesetting"
-            ),
-            payload='{"action": "get_menu_info"}',
-            retain=False,
-        )
-
     @property
     def device_info(self):
         return {
@@ -198,3 +136,103 @@ class HisenseTvSensor(SensorEntity, HisenseTvBase):
     def unique_id(self):
         """Return the unique id of the device."""
         return self._unique_id
+
+
+class HisenseTvPictureSensor(SensorEntity, HisenseTvPictureBase):
+    """Sensor for one picture setting, updated only when that setting changes."""
+
+    @staticmethod
+    def supports(setting):
+        """Return True for read-only settings, without a number or select entity."""
+        return not is_numeric(setting) and not has_options(setting)
+
+    @property
+    def native_value(self):
+        """Return the value of the picture setting."""
+        setting = self._setting
+        return setting.value if setting is not None else None
+
+
+class HisenseTvStatsSensor(SensorEntity):
+    """Diagnostic sensor exposing one protocol statistic of a TV."""
+
+    def __init__(self, coordinator, name, uid, key):
+        self._stats = coordinator.stats
+        self._key = key
+        self._device_uid = uid
+        label, unit = STATS_SENSORS[key]
+        self._attr_name = "%s %s" % (name, label)
+        self._attr_unique_id = "%s_%s" % (uid, key)
+        self._attr_native_unit_of_measurement = unit
+        self._attr_entity_category = ENTITY_CATEGORY_DIAGNOSTIC
+        self._attr_icon = "mdi:chart-bell-curve"
+
+    @property
+    def native_value(self):
+        """Return the total count or the mean duration over all topics."""
+        values = getattr(self._stats, self._key)
+        if isinstance(values, Counter):
+            return sum(values.values())
+        count = sum(histogram.count for histogram in values.values())
+        if not count:
+            return None
+        total = sum(histogram.total for histogram in values.values())
+        return round(total / count * 1000, 2)
+
+    @property
+    def extra_state_attributes(self):
+        """Return the statistic per topic name."""
+        values = getattr(self._stats, self._key)
+        if isinstance(values, Counter):
+            return dict(values)
+        return {
+            name: round(histogram.mean * 1000, 2)
+            for name, histogram in values.items()
+            if histogram.count
+        }
+
+    @property
+    def device_info(self):
+        return {"identifiers": {(DOMAIN, self._device_uid)}}
+
+
+class HisenseTvAckSensor(SensorEntity):
+    """Diagnostic sensor of the acknowledgements of a TV's commands."""
+
+    def __init__(self, coordinator, name, uid, key):
+        self._acks = coordinator.acks
+        self._key = key
+        self._device_uid = uid
+        label, unit = ACK_SENSORS[key]
+        self._attr_name = "%s %s" % (name, label)
+        self._attr_unique_id = "%s_%s" % (uid, key)
+        self._attr_native_unit_of_measurement = unit
+        self._attr_entity_category = ENTITY_CATEGORY_DIAGNOSTIC
+        self._attr_icon = "mdi:timer-check-outline"
+
+    @property
+    def native_value(self):
+        """Return the latest latency or the number of timed out commands."""
+        if self._key == "unacknowledged":
+            return sum(self._acks.timeouts.values())
+        recent = self._acks.recent
+        return round(recent[-1] * 1000, 2) if recent else None
+
+    @property
+    def extra_state_attributes(self):
+        """Return the values per command, and the recent window for latency."""
+        if self._key == "unacknowledged":
+            return dict(self._acks.timeouts)
+        stats = self._acks.stats
+        attributes = {
+            name: round(latency * 1000, 2)
+            for name, latency in stats["last_by_command"].items()
+        }
+        if stats["recent_mean"] is not None:
+            attributes["recent_mean"] = round(stats["recent_mean"] * 1000, 2)
+            attributes["recent_max"] = round(stats["recent_max"] * 1000, 2)
+        return attributes
+
+    @property
+    def device_info(self):
+        return {"identifiers": {(DOMAIN, self._device_uid)}}
@@ -0,0 +1,85 @@
+"""Hisense TV protocol instrumentation."""
+from bisect import bisect_left
+from collections import Counter
+
+
+class Histogram:
+    """Fixed bucket histogram of durations in seconds."""
+
+    BOUNDS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+    __slots__ = ("buckets", "count", "total", "max")
+
+    def __init__(self):
+        self.buckets = [0] * (len(self.BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, value):
+        """Record one duration."""
+        self.buckets[bisect_left(self.BOUNDS, value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    @property
+    def mean(self):
+        """Return the mean duration or None without samples."""
+        return self.total / self.count if self.count else None
+
+    def as_dict(self):
+        """Return a JSON serialisable summary."""
+        labels = ["le_%s" % bound for bound in self.BOUNDS] + ["inf"]
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "max": self.max,
+            "buckets": dict(zip(labels, self.buckets)),
+        }
+
+
+class HisenseTvStats:
+    """Message counters and latency histograms of one TV."""
+
+    def __init__(self):
+        self.messages_in = Counter()
+        self.messages_out = Counter()
+        self.timeouts = Counter()
+        self.handler_time = {}
+        self.round_trip = {}
+
+    @staticmethod
+    def _add(histograms, name, value):
+        histogram = histograms.get(name)
+        if histogram is None:
+            histogram = histograms[name] = Histogram()
+        histogram.add(value)
+
+    def record_in(self, name, duration):
+        """Count a received message and the time its handler took."""
+        self.messages_in[name] += 1
+        self._add(self.handler_time, name, duration)
+
+    def record_out(self, name):
+        """Count a published message."""
+        self.messages_out[name] += 1
+
+    def record_round_trip(self, name, duration):
+        """Record the time between a request and its reply."""
+        self._add(self.round_trip, name, duration)
+
+    def record_timeout(self, name):
+        """Count a request that got no reply."""
+        self.timeouts[name] += 1
+
+    def as_dict(self):
+        """Return a JSON serialisable snapshot."""
+        return {
+            "messages_in": dict(self.messages_in),
+            "messages_out": dict(self.messages_out),
+            "timeouts": dict(self.timeouts),
+            "handler_time": {k: v.as_dict() for k, v in self.handler_time.items()},
+            "round_trip": {k: v.as_dict() for k, v in self.round_trip.items()},
+        }
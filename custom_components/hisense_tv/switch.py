@@ -3,11 +3,11 @@ import logging
 
 import wakeonlan
 
-from homeassistant.components import mqtt
 from homeassistant.components.switch import DEVICE_CLASS_SWITCH, SwitchEntity
 from homeassistant.const import CONF_IP_ADDRESS, CONF_MAC, CONF_NAME
+from homeassistant.core import callback
 
-from .const import CONF_MQTT_IN, CONF_MQTT_OUT, DEFAULT_NAME, DOMAIN
+from .const import DEFAULT_NAME, DOMAIN
 from .helper import HisenseTvBase
 
 _LOGGER = logging.getLogger(__name__)
@@ -20,17 +20,14 @@ async def async_setup_entry(hass, config_entry, async_add_entities):
     name = config_entry.data[CONF_NAME]
     mac = config_entry.data[CONF_MAC]
     ip_address = config_entry.data.get(CONF_IP_ADDRESS, wakeonlan.BROADCAST_IP)
-    mqtt_in = config_entry.data[CONF_MQTT_IN]
-    mqtt_out = config_entry.data[CONF_MQTT_OUT]
     uid = config_entry.unique_id
     if uid is None:
         uid = config_entry.entry_id
 
     entity = HisenseTvSwitch(
         hass=hass,
+        coordinator=hass.data[DOMAIN][config_entry.entry_id],
         name=name,
-        mqtt_in=mqtt_in,
-        mqtt_out=mqtt_out,
         mac=mac,
         uid=uid,
         ip_address=ip_address,
@@ -41,35 +38,30 @@ async def async_setup_entry(hass, config_entry, async_add_entities):
 class HisenseTvSwitch(SwitchEntity, HisenseTvBase):
     """Hisense TV switch entity."""
 
-    def __init__(self, hass, name, mqtt_in, mqtt_out, mac, uid, ip_address):
+    def __init__(self, hass, coordinator, name, mac, uid, ip_address):
         HisenseTvBase.__init__(
             self=self,
             hass=hass,
+            coordinator=coordinator,
             name=name,
-            mqtt_in=mqtt_in,
-            mqtt_out=mqtt_out,
             mac=mac,
             uid=uid,
             ip_address=ip_address,
         )
-        self._is_on = False
+        self._tv = coordinator.state
 
     async def async_turn_on(self, **kwargs):
         """Turn the entity on."""
-        wakeonlan.send_magic_packet(self._mac, ip_address=self._ip_address)
+        _LOGGER.debug("turn_on %s (%s)", self._mac, self._ip_address)
+        await self._coordinator.async_turn_on()
 
     async def async_turn_off(self, **kwargs):
         """Turn the entity off."""
-        await mqtt.async_publish(
-            hass=self._hass,
-            topic=self._out_topic("/remoteapp/tv/remote_service/%s/actions/sendkey"),
-            payload="KEY_POWER",
-            retain=False,
-        )
+        await self._coordinator.async_turn_off()
 
     @property
     def is_on(self):
-        return self._is_on
+        return self._tv.is_on
 
     @property
     def device_info(self):
@@ -102,49 +94,13 @@ class HisenseTvSwitch(SwitchEntity, HisenseTvBase):
         """No polling needed."""
         return False
 
-    async def async_will_remove_from_hass(self):
-        for unsubscribe in list(self._subscriptions.values()):
-            unsubscribe()
-
     async def async_added_to_hass(self):
-        self._subscriptions["tvsleep"] = await mqtt.async_subscribe(
-            self._hass,
-            self._in_topic(
-                "/remoteapp/mobile/broadcast/platform_service/actions/tvsleep"
-            ),
-            self._message_received_turnoff,
-        )
-
-        self._subscriptions["state"] = await mqtt.async_subscribe(
-            self._hass,
-            self._in_topic("/remoteapp/mobile/broadcast/ui_service/state"),
-            self._message_received_state,
-        )
-
-        self._subscriptions["volume"] = await mqtt.async_subscribe(
-            self._hass,
-            self._in_topic(
-                "/remoteapp/mobile/broadcast/platform_service/actions/volumechange"
-            ),
-            self._message_received_state,
-        )
-
-        self._subscriptions["sourcelist"] = await mqtt.async_subscribe(
-            self._hass,
-            self._out_topic("/remoteapp/mobile/%s/ui_service/data/sourcelist"),
-            self._message_received_state,
+        self.async_on_remove(
+            self._coordinator.async_add_listener(self._handle_coordinator_update)
         )
+        self.async_on_remove(self._async_cancel_write)
 
-    async def _message_received_turnoff(self, msg):
-        _LOGGER.debug("message_received_turnoff")
-        self._is_on = False
-        self.async_write_ha_state()
-
-    async def _message_received_state(self, msg):
-        if msg.retain:
-            _LOGGER.debug("SWITCH message_received_state - skip retained message")
-            return
-
-        _LOGGER.debug("SWITCH message_received_state - turn on")
-        self._is_on = True
-        self.async_write_ha_state()
+    @callback
+    def _handle_coordinator_update(self, update_type):
+        _LOGGER.debug("SWITCH coordinator update %s", update_type)
+        self._async_write_state_throttled()
@@ -0,0 +1,68 @@
+"""Hisense TV MQTT topic table."""
+from types import MappingProxyType
+
+SUBSCRIBE_TOPICS = {
+    "tvsleep": "/remoteapp/mobile/broadcast/platform_service/actions/tvsleep",
+    "state": "/remoteapp/mobile/broadcast/ui_service/state",
+    "volumechange": (
+        "/remoteapp/mobile/broadcast/platform_service/actions/volumechange"
+    ),
+    "sourcelist": "/remoteapp/mobile/%s/ui_service/data/sourcelist",
+    "picturesetting": "/remoteapp/mobile/%s/platform_service/data/picturesetting",
+    "picturesetting_value": (
+        "/remoteapp/mobile/broadcast/platform_service/data/picturesetting"
+    ),
+    "getchannellistinfo": (
+        "/remoteapp/mobile/%s/platform_service/data/getchannellistinfo"
+    ),
+    "channellist": "/remoteapp/mobile/%s/platform_service/data/channellist",
+    "applist": "/remoteapp/mobile/%s/ui_service/data/applist",
+}
+
+PUBLISH_TOPICS = {
+    "sendkey": "/remoteapp/tv/remote_service/%s/actions/sendkey",
+    "changevolume": "/remoteapp/tv/platform_service/%s/actions/changevolume",
+    "getvolume": "/remoteapp/tv/platform_service/%s/actions/getvolume",
+    "sourcelist": "/remoteapp/tv/ui_service/%s/actions/sourcelist",
+    "changesource": "/remoteapp/tv/ui_service/%s/actions/changesource",
+    "changechannel": "/remoteapp/tv/ui_service/%s/actions/changechannel",
+    "launchapp": "/remoteapp/tv/ui_service/%s/actions/launchapp",
+    "getchannellistinfo": (
+        "/remoteapp/tv/platform_service/%s/actions/getchannellistinfo"
+    ),
+    "channellist": "/remoteapp/tv/platform_service/%s/actions/channellist",
+    "applist": "/remoteapp/tv/ui_service/%s/actions/applist",
+    "picturesetting": "/remoteapp/tv/platform_service/%s/actions/picturesetting",
+}
+
+
+def _format(prefix, template, client_id):
+    if "%s" in template:
+        return prefix + template % client_id
+    return prefix + template
+
+
+class HisenseTvTopics:
+    """Immutable table of all topics of one TV, computed once."""
+
+    __slots__ = ("subscribe", "publish", "lookup")
+
+    def __init__(self, mqtt_in, mqtt_out, client_id):
+        subscribe = {
+            name: _format(mqtt_in or "", template, client_id)
+            for name, template in SUBSCRIBE_TOPICS.items()
+        }
+        publish = {
+            name: _format(mqtt_out or "", template, client_id)
+            for name, template in PUBLISH_TOPICS.items()
+        }
+        object.__setattr__(self, "subscribe", MappingProxyType(subscribe))
+        object.__setattr__(self, "publish", MappingProxyType(publish))
+        object.__setattr__(
+            self,
+            "lookup",
+            MappingProxyType({topic: name for name, topic in subscribe.items()}),
+        )
+
+    def __setattr__(self, name, value):
+        raise AttributeError("HisenseTvTopics is immutable")
@@ -0,0 +1,24 @@
+"""Hisense TV Wake-on-LAN sender."""
+import asyncio
+import logging
+import socket
+
+import wakeonlan
+
+_LOGGER = logging.getLogger(__name__)
+
+
+async def async_send_magic_packet(mac, addresses, burst=3):
+    """Send a burst of magic packets to every address without blocking the loop."""
+    packet = wakeonlan.create_magic_packet(mac)
+    loop = asyncio.get_running_loop()
+    transport, _ = await loop.create_datagram_endpoint(
+        asyncio.DatagramProtocol, family=socket.AF_INET, allow_broadcast=True
+    )
+    try:
+        for _ in range(burst):
+            for address in addresses:
+                _LOGGER.debug("magic packet %s -> %s", mac, address)
+                transport.sendto(packet, (address, wakeonlan.DEFAULT_PORT))
+    finally:
+        transport.close()
@@ -0,0 +1,379 @@
+"""Simulate Hisense TVs speaking the remoteapp MQTT protocol.
+
+Runs any number of virtual TVs against a local MQTT broker so the
+integration can be exercised without hardware. Every TV lives under its
+own topic prefix, just like a bridged real TV:
+
+    python scripts/hisense_tv_simulator.py --tvs 200 --prefix "tv%03d"
+
+Configure the integration with the same prefix for mqtt_in and mqtt_out.
+Requires paho-mqtt.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import random
+import socket
+
+import paho.mqtt.client as mqtt_client
+
+_LOGGER = logging.getLogger("hisense_tv_simulator")
+
+SOURCES = ["TV", "HDMI1", "HDMI2", "HDMI3", "AV"]
+APPS = ["Netflix", "YouTube", "Prime Video", "Disney+", "Browser"]
+PICTURE_SETTINGS = {
+    91: ("Picture Mode", "Standard"),
+    92: ("Backlight", 50),
+    93: ("Brightness", 50),
+    94: ("Contrast", 50),
+    95: ("Color Saturation", 50),
+    96: ("Sharpness", 10),
+}
+PICTURE_MODES = ["Standard", "Vivid", "Cinema", "Game"]
+DIGIT_KEYS = {"KEY_%d" % digit: str(digit) for digit in range(10)}
+
+
+class VirtualTv:
+    """State and protocol handling of one simulated TV."""
+
+    def __init__(self, simulator, prefix, index, args):
+        self.simulator = simulator
+        self.prefix = prefix
+        self.mac = "02:00:00:00:%02x:%02x" % (index // 256, index % 256)
+        self.on = True
+        self.volume = 20
+        self.muted = False
+        self.source = "TV"
+        self.channel = 0
+        self.digits = ""
+        self.authorized = set() if args.pin is not None else None
+        self.pin = args.pin
+        self.lists = {
+            str(list_para): [
+                {
+                    "channel_name": "Channel %d-%d" % (list_para, num),
+                    "channel_num": str(num),
+                    "channel_param": "%d:%d" % (list_para, num),
+                }
+                for num in range(1, args.channels + 1)
+            ]
+            for list_para in range(1, args.lists + 1)
+        }
+        self.picture = {
+            menu_id: {"menu_id": menu_id, "menu_name": name, "menu_value": value}
+            for menu_id, (name, value) in PICTURE_SETTINGS.items()
+        }
+        self.picture[91]["menu_para"] = PICTURE_MODES
+
+    def reply(self, client, service, data, payload):
+        self.simulator.publish(
+            "%s/remoteapp/mobile/%s/%s/data/%s" % (self.prefix, client, service, data),
+            payload,
+        )
+
+    def broadcast(self, path, payload):
+        self.simulator.publish(
+            "%s/remoteapp/mobile/broadcast/%s" % (self.prefix, path), payload
+        )
+
+    def broadcast_state(self, payload):
+        self.broadcast("ui_service/state", payload)
+
+    def broadcast_volume(self):
+        self.broadcast(
+            "platform_service/actions/volumechange",
+            {"volume_type": 0, "volume_value": self.volume},
+        )
+
+    def broadcast_channel(self):
+        if not self.lists:
+            self.broadcast_state({"statetype": "sourceswitch", "sourcename": "TV"})
+            return
+        list_para, channels = next(iter(self.lists.items()))
+        item = channels[self.channel % len(channels)]
+        self.broadcast_state(
+            {
+                "statetype": "livetv",
+                "progname": "Programme on %s" % item["channel_name"],
+                "channel_name": item["channel_name"],
+                "channel_num": item["channel_num"],
+                "sourceid": list_para,
+            }
+        )
+
+    def power(self, on):
+        self.on = on
+        if on:
+            self.broadcast_channel()
+        else:
+            self.broadcast("platform_service/actions/tvsleep", "")
+
+    def handle(self, client, service, action, payload):
+        """Handle one action published by a client."""
+        if action == "gettvstate":
+            # only used to authenticate, a TV never answers it with a state
+            if self.authorized is not None and client not in self.authorized:
+                self.reply(client, "ui_service", "authentication", "")
+            return
+        if action == "authenticationcode":
+            ok = json.loads(payload or "{}").get("authNum") == self.pin
+            if ok:
+                self.authorized.add(client)
+            self.reply(
+                client, "ui_service", "authenticationcode", {"result": int(ok)}
+            )
+            return
+        if self.authorized is not None and client not in self.authorized:
+            return
+        if action == "sendkey":
+            self.sendkey(payload)
+            return
+        if not self.on:
+            return
+
+        if action == "changevolume":
+            self.volume = max(0, min(100, int(payload)))
+            self.broadcast_volume()
+        elif action == "getvolume":
+            self.broadcast_volume()
+        elif action == "sourcelist":
+            self.reply(
+                client,
+                "ui_service",
+                "sourcelist",
+                [
+                    {"sourceid": str(i), "sourcename": name, "displayname": name}
+                    for i, name in enumerate(SOURCES)
+                ],
+            )
+        elif action == "changesource":
+            self.source = json.loads(payload).get("sourcename")
+            self.broadcast_state(
+                {
+                    "statetype": "sourceswitch",
+                    "sourceid": str(SOURCES.index(self.source)),
+                    "sourcename": self.source,
+                    "displayname": self.source,
+                    "is_signal": 1,
+                }
+            )
+        elif action == "getchannellistinfo":
+            self.reply(
+                client,
+                "platform_service",
+                "getchannellistinfo",
+                [
+                    {"list_para": list_para, "list_name": "List %s" % list_para}
+                    for list_para in self.lists
+                ],
+            )
+        elif action == "channellist":
+            list_para = json.loads(payload).get("list_para")
+            self.reply(
+                client,
+                "platform_service",
+                "channellist",
+                {"list_para": list_para, "list": self.lists.get(list_para, [])},
+            )
+        elif action == "changechannel":
+            channel_param = json.loads(payload).get("channel_param", "")
+            self.channel = int(channel_param.rpartition(":")[2] or 1) - 1
+            self.broadcast_channel()
+        elif action == "applist":
+            self.reply(
+                client,
+                "ui_service",
+                "applist",
+                [
+                    {"appId": str(i), "name": name, "url": name.lower()}
+                    for i, name in enumerate(APPS)
+                ],
+            )
+        elif action == "launchapp":
+            app = json.loads(payload)
+            self.broadcast_state(
+                {"statetype": "app", "name": app.get("name"), "url": app.get("url")}
+            )
+        elif action == "picturesetting":
+            self.picturesetting(client, json.loads(payload or "{}"))
+
+    def sendkey(self, key):
+        if key == "KEY_POWER":
+            self.power(not self.on)
+        elif not self.on:
+            return
+        elif key in ("KEY_VOLUMEUP", "KEY_VOLUMEDOWN"):
+            step = 1 if key == "KEY_VOLUMEUP" else -1
+            self.volume = max(0, min(100, self.volume + step))
+            self.broadcast_volume()
+        elif key == "KEY_MUTE":
+            self.muted = not self.muted
+            self.broadcast(
+                "platform_service/actions/volumechange",
+                {"volume_type": 2, "volume_value": int(self.muted)},
+            )
+        elif key == "KEY_HOME":
+            self.broadcast_state({"statetype": "remote_launcher"})
+        elif key in DIGIT_KEYS:
+            self.digits += DIGIT_KEYS[key]
+            self.simulator.call_later(1.5, self.commit_digits)
+        elif key in ("KEY_CHANNELUP", "KEY_CHANNELDOWN"):
+            self.channel += 1 if key == "KEY_CHANNELUP" else -1
+            self.broadcast_channel()
+
+    def commit_digits(self):
+        if self.digits:
+            self.channel = int(self.digits) - 1
+            self.digits = ""
+            self.broadcast_channel()
+
+    def picturesetting(self, client, payload):
+        if payload.get("action") == "get_menu_info":
+            menu_info = list(self.picture.values())
+            self.reply(
+                client,
+                "platform_service",
+                "picturesetting",
+                {"action": "resp_get_menu_info", "menu_info": menu_info},
+            )
+        elif payload.get("action") == "set_value":
+            item = self.picture.get(payload.get("menu_id"))
+            if item is None:
+                return
+            item["menu_value"] = payload.get("menu_value")
+            self.broadcast(
+                "platform_service/data/picturesetting",
+                {
+                    "action": "notify_value_changed",
+                    "menu_id": item["menu_id"],
+                    "menu_value": item["menu_value"],
+                },
+            )
+
+
+class Simulator:
+    """Many virtual TVs sharing one broker connection."""
+
+    def __init__(self, args):
+        self.args = args
+        self.loop = None
+        self.tvs = {}
+        for index in range(args.tvs):
+            prefix = args.prefix % index if "%" in args.prefix else args.prefix
+            self.tvs[prefix] = VirtualTv(self, prefix, index, args)
+        self.by_mac = {
+            bytes.fromhex(tv.mac.replace(":", "")): tv for tv in self.tvs.values()
+        }
+        if hasattr(mqtt_client, "CallbackAPIVersion"):
+            self.client = mqtt_client.Client(
+                mqtt_client.CallbackAPIVersion.VERSION1, client_id=args.client_id
+            )
+        else:
+            self.client = mqtt_client.Client(client_id=args.client_id)
+        if args.username:
+            self.client.username_pw_set(args.username, args.password)
+        self.client.on_connect = self.on_connect
+        self.client.on_message = self.on_message
+
+    def call_later(self, delay, func, *args):
+        self.loop.call_later(delay, func, *args)
+
+    def publish(self, topic, payload):
+        """Publish a reply after the configured delay, jitter and drop rate."""
+        if random.random() < self.args.drop:
+            _LOGGER.debug("drop %s", topic)
+            return
+        if not isinstance(payload, str):
+            payload = json.dumps(payload)
+        delay = max(0.0, self.args.delay + random.uniform(0, self.args.jitter))
+        self.loop.call_later(delay, self.client.publish, topic, payload)
+
+    def on_connect(self, client, userdata, flags, rc):
+        _LOGGER.info("connected (rc=%s), simulating %d TVs", rc, len(self.tvs))
+        client.subscribe([(prefix + "/remoteapp/tv/#", 0) for prefix in self.tvs])
+
+    def on_message(self, client, userdata, msg):
+        self.loop.call_soon_threadsafe(self.dispatch, msg.topic, msg.payload)
+
+    def dispatch(self, topic, payload):
+        prefix, sep, rest = topic.partition("/remoteapp/tv/")
+        tv = self.tvs.get(prefix)
+        if not sep or tv is None:
+            return
+        try:
+            service, client, _, action = rest.split("/")
+        except ValueError:
+            return
+        _LOGGER.debug("%s %s %s", prefix, action, payload[:80])
+        try:
+            tv.handle(client, service, action, payload.decode("utf-8"))
+        except (ValueError, AttributeError) as err:
+            _LOGGER.warning("%s: bad %s payload %r: %s", prefix, action, payload, err)
+
+    def datagram_received(self, data, addr):
+        """Wake a virtual TV on a magic packet carrying its MAC."""
+        if len(data) >= 102 and data[:6] == b"\xff" * 6:
+            tv = self.by_mac.get(data[6:12])
+            if tv is not None and not tv.on:
+                _LOGGER.info("wake %s from %s", tv.prefix, addr[0])
+                self.call_later(self.args.boot_time, tv.power, True)
+
+    def connection_made(self, transport):
+        pass
+
+    def error_received(self, exc):
+        pass
+
+    def connection_lost(self, exc):
+        pass
+
+    async def run(self):
+        self.loop = asyncio.get_running_loop()
+        if self.args.wol_port:
+            await self.loop.create_datagram_endpoint(
+                lambda: self,
+                local_addr=("0.0.0.0", self.args.wol_port),
+                family=socket.AF_INET,
+                allow_broadcast=True,
+            )
+        self.client.connect(self.args.host, self.args.port)
+        self.client.loop_start()
+        try:
+            await asyncio.Event().wait()
+        finally:
+            self.client.loop_stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=1883)
+    parser.add_argument("--username")
+    parser.add_argument("--password")
+    parser.add_argument("--client-id", default="hisense_tv_simulator")
+    parser.add_argument(
+        "--prefix", default="hisense", help="topic prefix, may contain %%d"
+    )
+    parser.add_argument("--tvs", type=int, default=1, help="number of TVs")
+    parser.add_argument("--delay", type=float, default=0.05, help="reply delay (s)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="max jitter (s)")
+    parser.add_argument("--drop", type=float, default=0.0, help="reply drop rate")
+    parser.add_argument("--lists", type=int, default=2, help="channel lists per TV")
+    parser.add_argument("--channels", type=int, default=100, help="channels per list")
+    parser.add_argument("--pin", type=int, help="require this PIN to pair")
+    parser.add_argument("--wol-port", type=int, help="listen for magic packets")
+    parser.add_argument("--boot-time", type=float, default=3.0)
+    parser.add_argument("-v", "--verbose", action="store_true")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO)
+    if args.tvs > 1 and "%" not in args.prefix:
+        parser.error("--prefix must contain %d when simulating several TVs")
+    try:
+        asyncio.run(Simulator(args).run())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,586 @@
+"""Test fixtures: a fake MQTT broker and a minimal Home Assistant stand-in.
+
+Home Assistant is not required. When it is not installed, the few APIs the
+integration uses are provided by stub modules, and the integration package
+is imported without running its __init__ (which needs the full config entry
+machinery). homeassistant.components.mqtt is always replaced by the fake
+broker.
+"""
+import asyncio
+import json
+import os
+import sys
+from time import monotonic, perf_counter
+import types
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PACKAGE_DIR = os.path.join(ROOT, "custom_components", "hisense_tv")
+BASELINE_FILE = os.path.join(os.path.dirname(__file__), "benchmark_baseline.json")
+RESULTS_FILE = os.environ.get(
+    "HISENSE_TV_BENCHMARK_RESULTS", os.path.join(ROOT, "benchmark_results.json")
+)
+UPDATE_BASELINE = os.environ.get("HISENSE_TV_UPDATE_BASELINE") == "1"
+
+sys.path.insert(0, ROOT)
+
+STATE_LIVETV = {
+    "statetype": "livetv",
+    "progname": "News",
+    "channel_name": "Channel 1",
+    "channel_num": "101",
+    "sourceid": "1",
+    "detail": "",
+    "starttime": 1650000000,
+    "endtime": 1650003600,
+}
+
+# sample payload per handler, keyed by a label and the subscribe topic name
+SAMPLES = {
+    "state": ("state", STATE_LIVETV),
+    "state_sourceswitch": (
+        "state",
+        {
+            "statetype": "sourceswitch",
+            "sourceid": "2",
+            "sourcename": "HDMI1",
+            "displayname": "HDMI1",
+            "is_signal": 1,
+        },
+    ),
+    "volumechange": ("volumechange", {"volume_type": 0, "volume_value": 20}),
+    "sourcelist": (
+        "sourcelist",
+        [
+            {"sourceid": str(i), "sourcename": name, "displayname": name}
+            for i, name in enumerate(["TV", "HDMI1", "HDMI2", "HDMI3", "AV"])
+        ],
+    ),
+    "picturesetting": (
+        "picturesetting",
+        {
+            "action": "resp_get_menu_info",
+            "menu_info": [
+                {"menu_id": 91 + i, "menu_name": "Setting %d" % i, "menu_value": 50}
+                for i in range(6)
+            ],
+        },
+    ),
+    "picturesetting_value": (
+        "picturesetting_value",
+        {"action": "notify_value_changed", "menu_id": 92, "menu_value": 40},
+    ),
+    "tvsleep": ("tvsleep", ""),
+}
+
+
+def payload_text(payload):
+    """Return a sample payload as the JSON text the TV sends."""
+    return payload if isinstance(payload, str) else json.dumps(payload)
+
+
+class Message:
+    """MQTT message as delivered to subscription callbacks."""
+
+    __slots__ = ("topic", "payload", "qos", "retain")
+
+    def __init__(self, topic, payload, retain=False):
+        self.topic = topic
+        self.payload = payload
+        self.qos = 0
+        self.retain = retain
+
+
+def topic_matches(topic_filter, topic):
+    """Return True if an MQTT topic filter with + and # matches a topic."""
+    filter_levels = topic_filter.split("/")
+    levels = topic.split("/")
+    for index, level in enumerate(filter_levels):
+        if level == "#":
+            return True
+        if index >= len(levels) or level not in ("+", levels[index]):
+            return False
+    return len(filter_levels) == len(levels)
+
+
+class FakeBroker:
+    """In-process broker replacing mqtt.async_publish and async_subscribe."""
+
+    def __init__(self):
+        self.subscriptions = []
+        self.published = []
+        self.responders = {}
+
+    @property
+    def subscription_count(self):
+        return len(self.subscriptions)
+
+    async def async_subscribe(self, hass, topic, msg_callback, qos=0, encoding="utf-8"):
+        subscription = (topic, msg_callback, encoding)
+        self.subscriptions.append(subscription)
+
+        def unsubscribe():
+            self.subscriptions.remove(subscription)
+
+        return unsubscribe
+
+    async def async_publish(self, hass, topic, payload, qos=0, retain=False):
+        self.published.append((topic, payload))
+        responder = self.responders.get(topic)
+        if responder is not None:
+            reply = responder(payload)
+            if reply is not None:
+                asyncio.get_running_loop().create_task(self.async_deliver(*reply))
+
+    def respond(self, topic, responder):
+        """Answer publishes to a topic with responder(payload) -> (topic, payload)."""
+        self.responders[topic] = responder
+
+    def encode(self, topic, payload, retain=False):
+        """Return the message the subscription of a topic would receive."""
+        payload = payload_text(payload)
+        for topic_filter, _, encoding in self.subscriptions:
+            if topic_matches(topic_filter, topic):
+                if encoding is None:
+                    return Message(topic, payload.encode("utf-8"), retain)
+                break
+        return Message(topic, payload, retain)
+
+    async def async_deliver(self, topic, payload, retain=False):
+        """Deliver a message to every matching subscription."""
+        payload = payload_text(payload)
+        for topic_filter, msg_callback, encoding in list(self.subscriptions):
+            if not topic_matches(topic_filter, topic):
+                continue
+            data = payload if encoding is not None else payload.encode("utf-8")
+            result = msg_callback(Message(topic, data, retain))
+            if result is not None:
+                await result
+
+
+BROKER = FakeBroker()
+
+
+class _ConstantsModule(types.ModuleType):
+    """Module returning a placeholder for constants that are not defined."""
+
+    _flags = {}
+
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        if name.startswith("SUPPORT_"):
+            return self._flags.setdefault(name, 1 << len(self._flags))
+        return name.lower()
+
+
+def _module(name, module_type=types.ModuleType, **attrs):
+    module = module_type(name)
+    module.__dict__.update(attrs)
+    sys.modules[name] = module
+    parent, _, child = name.rpartition(".")
+    if parent in sys.modules:
+        setattr(sys.modules[parent], child, module)
+    return module
+
+
+class Entity:
+    """Stand-in for homeassistant.helpers.entity.Entity recording state writes."""
+
+    hass = None
+    entity_id = None
+    available = True
+    capability_attributes = None
+    state_attributes = None
+    extra_state_attributes = None
+
+    def async_on_remove(self, func):
+        self.__dict__.setdefault("_on_remove", []).append(func)
+
+    async def async_remove(self):
+        for func in self.__dict__.pop("_on_remove", []):
+            func()
+
+    def async_write_ha_state(self):
+        self.hass.async_state_written(self)
+
+
+class MediaPlayerEntity(Entity):
+    @property
+    def state_attributes(self):
+        return {
+            "volume_level": self.volume_level,
+            "is_volume_muted": self.is_volume_muted,
+            "source": self.source,
+            "source_list": self.source_list,
+            "media_title": self.media_title,
+            "media_series_title": self.media_series_title,
+        }
+
+
+class SwitchEntity(Entity):
+    @property
+    def state(self):
+        return "on" if self.is_on else "off"
+
+
+class SensorEntity(Entity):
+    @property
+    def state(self):
+        return self.native_value
+
+
+class BrowseMedia:
+    def __init__(self, children=None, **kwargs):
+        self.children = children
+        self.__dict__.update(kwargs)
+
+
+def _install_homeassistant_stubs():
+    import voluptuous as vol
+
+    def callback(func):
+        func._hass_callback = True
+        return func
+
+    def async_call_later(hass, delay, action):
+        def run():
+            result = action(None)
+            if asyncio.iscoroutine(result):
+                hass.loop.create_task(result)
+
+        handle = hass.loop.call_later(delay, run)
+        return handle.cancel
+
+    class HomeAssistantError(Exception):
+        """Stand-in for homeassistant.exceptions.HomeAssistantError."""
+
+    class Store:
+        def __init__(self, hass, version, key):
+            self.key = key
+            self.data = None
+
+        async def async_load(self):
+            return self.data
+
+        def async_delay_save(self, data_func, delay=0):
+            pass
+
+        async def async_remove(self):
+            self.data = None
+
+    def utcnow():
+        import datetime
+
+        return datetime.datetime.now(datetime.timezone.utc)
+
+    _module("homeassistant", __path__=[])
+    _module("homeassistant.components", __path__=[])
+    _module(
+        "homeassistant.const",
+        _ConstantsModule,
+        CONF_IP_ADDRESS="ip_address",
+        CONF_MAC="mac",
+        CONF_NAME="name",
+        MAJOR_VERSION=2021,
+        MINOR_VERSION=12,
+        STATE_OFF="off",
+        STATE_ON="on",
+    )
+    _module("homeassistant.core", callback=callback, HomeAssistant=object)
+    _module("homeassistant.config_entries", ConfigEntry=object, SOURCE_IMPORT="import")
+    _module("homeassistant.exceptions", HomeAssistantError=HomeAssistantError)
+    _module("homeassistant.helpers", __path__=[])
+    _module(
+        "homeassistant.helpers.config_validation",
+        _ConstantsModule,
+        string=str,
+        Number=vol.Number,
+    )
+    _module("homeassistant.helpers.entity", Entity=Entity)
+    _module("homeassistant.helpers.event", async_call_later=async_call_later)
+    _module("homeassistant.helpers.storage", Store=Store)
+    _module("homeassistant.util", __path__=[])
+    _module("homeassistant.util.dt", utcnow=utcnow)
+    _module(
+        "homeassistant.components.media_player",
+        _ConstantsModule,
+        __path__=[],
+        PLATFORM_SCHEMA=vol.Schema({}),
+        BrowseMedia=BrowseMedia,
+        MediaPlayerEntity=MediaPlayerEntity,
+    )
+    _module("homeassistant.components.media_player.const", _ConstantsModule)
+    _module("homeassistant.components.number", NumberEntity=Entity)
+    _module("homeassistant.components.remote", _ConstantsModule, RemoteEntity=Entity)
+    _module("homeassistant.components.select", SelectEntity=Entity)
+    _module("homeassistant.components.sensor", SensorEntity=SensorEntity)
+    _module(
+        "homeassistant.components.switch", _ConstantsModule, SwitchEntity=SwitchEntity
+    )
+
+
+def _install_stubs():
+    try:
+        import homeassistant  # noqa: F401
+    except ImportError:
+        _install_homeassistant_stubs()
+        # import the platforms without the config entry setup in __init__
+        _module("custom_components", __path__=[os.path.join(ROOT, "custom_components")])
+        _module(
+            "custom_components.hisense_tv",
+            __path__=[PACKAGE_DIR],
+            __package__="custom_components.hisense_tv",
+        )
+    _module(
+        "homeassistant.components.mqtt",
+        async_publish=lambda *args, **kwargs: BROKER.async_publish(*args, **kwargs),
+        async_subscribe=lambda *args, **kwargs: BROKER.async_subscribe(
+            *args, **kwargs
+        ),
+    )
+
+
+_install_stubs()
+
+
+class FakeConfig:
+    def __init__(self, tmp_path):
+        self._tmp_path = tmp_path
+        self.allowlist_external_dirs = set()
+
+    def path(self, *parts):
+        return os.path.join(str(self._tmp_path), *parts)
+
+    def is_allowed_path(self, path):
+        return any(
+            os.path.commonpath([path, allowed]) == allowed
+            for allowed in self.allowlist_external_dirs
+        )
+
+
+class FakeHass:
+    """The parts of HomeAssistant the integration relies on."""
+
+    def __init__(self, loop, tmp_path):
+        self.loop = loop
+        self.data = {}
+        self.config = FakeConfig(tmp_path)
+        self.state_writes = []
+        self._write_waiters = []
+
+    def async_create_task(self, coro):
+        return self.loop.create_task(coro)
+
+    def async_add_executor_job(self, func, *args):
+        return self.loop.run_in_executor(None, func, *args)
+
+    def async_state_written(self, entity):
+        self.state_writes.append((entity.entity_id, monotonic()))
+        waiters, self._write_waiters = self._write_waiters, []
+        for waiter in waiters:
+            if not waiter.done():
+                waiter.set_result(entity)
+
+    def async_next_write(self):
+        """Return a future resolved by the next entity state write."""
+        waiter = self.loop.create_future()
+        self._write_waiters.append(waiter)
+        return waiter
+
+
+class FakeEntry:
+    def __init__(self, entry_id, mqtt_in, mqtt_out, options=None):
+        self.entry_id = entry_id
+        self.unique_id = entry_id
+        self.data = {
+            "name": "TV %s" % entry_id,
+            "mac": "02:00:00:00:00:01",
+            "ip_address": None,
+            "mqtt_in": mqtt_in,
+            "mqtt_out": mqtt_out,
+        }
+        self.options = options or {}
+
+
+@pytest.fixture
+def broker():
+    BROKER.__init__()
+    yield BROKER
+    BROKER.__init__()
+
+
+@pytest.fixture
+def loop():
+    loop = asyncio.new_event_loop()
+    yield loop
+    pending = [task for task in asyncio.all_tasks(loop) if not task.done()]
+    for task in pending:
+        task.cancel()
+    if pending:
+        loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+    loop.close()
+
+
+@pytest.fixture
+def hass(loop, tmp_path):
+    return FakeHass(loop, tmp_path)
+
+
+@pytest.fixture
+def make_coordinator(hass, loop, broker):
+    """Create and start coordinators, stopped again after the test."""
+    from custom_components.hisense_tv.const import DOMAIN
+    from custom_components.hisense_tv.coordinator import HisenseTvCoordinator
+
+    coordinators = []
+
+    def make(entry_id="tv", mqtt_in="hisense", mqtt_out="hisense", **options):
+        entry = FakeEntry(entry_id, mqtt_in, mqtt_out, options)
+        coordinator = HisenseTvCoordinator(hass=hass, entry=entry)
+        loop.run_until_complete(coordinator.async_start())
+        hass.data.setdefault(DOMAIN, {})[entry_id] = coordinator
+        coordinators.append(coordinator)
+        return coordinator
+
+    yield make
+    for coordinator in coordinators:
+        coordinator.async_stop()
+
+
+@pytest.fixture
+def add_entity(hass, loop):
+    """Add an entity the way the entity platform does, removed after the test."""
+    entities = []
+
+    def add(entity, entity_id):
+        entity.hass = hass
+        entity.entity_id = entity_id
+        loop.run_until_complete(entity.async_added_to_hass())
+        entities.append(entity)
+        return entity
+
+    yield add
+    for entity in entities:
+        loop.run_until_complete(entity.async_remove())
+
+
+def deliver(loop, broker, coordinator, key, payload=None):
+    """Deliver a sample message, or another payload, on its topic."""
+    name, sample = SAMPLES[key]
+    loop.run_until_complete(
+        broker.async_deliver(
+            coordinator.topics.subscribe[name], sample if payload is None else payload
+        )
+    )
+
+
+def best_of(loop, make_coro, count, rounds=5):
+    """Return the best mean time per operation in seconds."""
+    best = None
+    for _ in range(rounds):
+        started = perf_counter()
+        loop.run_until_complete(make_coro())
+        elapsed = (perf_counter() - started) / count
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def _calibrate():
+    """Time a fixed pure Python workload to express timings machine independent."""
+    text = json.dumps(SAMPLES["picturesetting"][1])
+    best = None
+    for _ in range(5):
+        started = perf_counter()
+        for _ in range(2000):
+            data = json.loads(text)
+            {item["menu_id"]: item["menu_value"] for item in data["menu_info"]}
+        elapsed = (perf_counter() - started) / 2000
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+class BenchmarkResults:
+    """Collects benchmark results and checks them against the baseline.
+
+    Timings are gated as multiples of a calibration workload timed right after
+    them, so the baseline holds on slower, faster or busy machines. Counts are
+    gated exactly. Set HISENSE_TV_UPDATE_BASELINE=1 to record a new baseline.
+    """
+
+    def __init__(self):
+        self.results = {}
+        self._calibration = None
+        try:
+            with open(BASELINE_FILE, encoding="utf-8") as baseline:
+                self.baseline = json.load(baseline)
+        except FileNotFoundError:
+            self.baseline = {}
+
+    @property
+    def calibration(self):
+        if self._calibration is None:
+            self._calibration = _calibrate()
+        return self._calibration
+
+    def time(self, name, seconds, tolerance=3.0):
+        """Gate the time of one operation relative to the calibration workload."""
+        self.results[name + ".us"] = {"value": seconds * 1e6, "unit": "us"}
+        # calibrate again, the load of the machine may have changed meanwhile
+        self.check(name, seconds / _calibrate(), "x calibration", tolerance)
+
+    def count(self, name, value):
+        """Gate a deterministic count, which must not grow."""
+        self.check(name, value, "count", 1)
+
+    def check(self, name, value, unit, tolerance):
+        """Record a result and fail if it exceeds tolerance times its baseline."""
+        self.results[name] = {"value": value, "unit": unit, "tolerance": tolerance}
+        if UPDATE_BASELINE:
+            return
+        reference = self.baseline.get(name)
+        assert reference is not None, (
+            "no baseline for %s, run with HISENSE_TV_UPDATE_BASELINE=1" % name
+        )
+        limit = reference["value"] * reference["tolerance"]
+        assert value <= limit, "%s regressed: %.3f %s > %.3f %s (baseline %.3f)" % (
+            name,
+            value,
+            unit,
+            limit,
+            unit,
+            reference["value"],
+        )
+
+    def write(self):
+        if not self.results:
+            return
+        self.results["calibration.us"] = {
+            "value": self.calibration * 1e6,
+            "unit": "us",
+        }
+        with open(RESULTS_FILE, "w", encoding="utf-8") as results:
+            json.dump(self.results, results, indent=4, sort_keys=True)
+        if UPDATE_BASELINE:
+            baseline = dict(self.baseline)
+            baseline.update(
+                (name, result)
+                for name, result in self.results.items()
+                if "tolerance" in result
+            )
+            with open(BASELINE_FILE, "w", encoding="utf-8") as output:
+                json.dump(baseline, output, indent=4, sort_keys=True)
+                output.write("\n")
+
+
+RESULTS = BenchmarkResults()
+
+
+@pytest.fixture
+def benchmark():
+    return RESULTS
+
+
+def pytest_sessionfinish(session, exitstatus):
+    RESULTS.write()
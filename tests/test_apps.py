@@ -0,0 +1,85 @@
+"""App catalogue and launching apps."""
+import json
+
+from homeassistant.exceptions import HomeAssistantError
+import pytest
+
+from custom_components.hisense_tv.apps import AppCatalogue
+
+NETFLIX = {"appId": "1", "name": "Netflix", "url": "netflix"}
+YOUTUBE = {"appId": "2", "name": "YouTube", "url": "youtube"}
+
+
+@pytest.fixture
+def tv(make_coordinator, broker):
+    """A coordinator whose TV answers app list requests with the installed apps."""
+    coordinator = make_coordinator()
+    installed = [NETFLIX]
+    requests = []
+
+    def app_list(payload):
+        requests.append(payload)
+        return coordinator.topics.subscribe["applist"], list(installed)
+
+    broker.respond(coordinator.topics.publish["applist"], app_list)
+    return coordinator, installed, requests
+
+
+def _launched(broker, coordinator):
+    topic = coordinator.topics.publish["launchapp"]
+    return [
+        json.loads(payload)["appId"]
+        for published, payload in broker.published
+        if published == topic
+    ]
+
+
+def test_find_by_id_and_name():
+    catalogue = AppCatalogue(
+        {
+            "1": NETFLIX,
+            "2": YOUTUBE,
+            "3": {"appId": "3", "name": "netflix", "url": "other"},
+        }
+    )
+    assert catalogue.find("2") is YOUTUBE
+    assert catalogue.find(2) is YOUTUBE
+    assert catalogue.find(" youtube ") is YOUTUBE
+    # the first app of a name wins
+    assert catalogue.find("NETFLIX") is NETFLIX
+    assert catalogue.find("Prime Video") is None
+
+
+def test_play_app_fetches_catalogue_once(loop, tv, broker):
+    coordinator, _, requests = tv
+    loop.run_until_complete(coordinator.async_play_app("netflix"))
+    loop.run_until_complete(coordinator.async_play_app("1"))
+    assert _launched(broker, coordinator) == ["1", "1"]
+    assert len(requests) == 1
+
+
+def test_missing_app_refreshes_once(loop, tv, broker):
+    coordinator, installed, requests = tv
+    loop.run_until_complete(coordinator.async_get_app_list())
+    # installed after the catalogue was fetched
+    installed.append(YOUTUBE)
+    loop.run_until_complete(coordinator.async_play_app("YouTube"))
+    assert _launched(broker, coordinator) == ["2"]
+    assert len(requests) == 2
+
+
+def test_unknown_app_raises_after_one_refresh(loop, tv, broker):
+    coordinator, _, requests = tv
+    loop.run_until_complete(coordinator.async_get_app_list())
+    with pytest.raises(HomeAssistantError):
+        loop.run_until_complete(coordinator.async_play_app("Prime Video"))
+    assert len(requests) == 2
+    assert not _launched(broker, coordinator)
+
+
+def test_unknown_app_without_catalogue_is_not_refreshed(loop, tv, broker):
+    coordinator, _, requests = tv
+    with pytest.raises(HomeAssistantError):
+        loop.run_until_complete(coordinator.async_play_app("Prime Video"))
+    # the first fetch is already fresh
+    assert len(requests) == 1
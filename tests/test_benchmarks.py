@@ -0,0 +1,246 @@
+"""Benchmarks of the message path, checked against benchmark_baseline.json."""
+import asyncio
+import json
+from time import perf_counter
+import tracemalloc
+
+from conftest import SAMPLES, best_of, deliver
+import pytest
+
+from custom_components.hisense_tv import helper
+from custom_components.hisense_tv.decode import decode_state
+from custom_components.hisense_tv.media_player import HisenseTvEntity
+from custom_components.hisense_tv.sensor import HisenseTvSensor
+from custom_components.hisense_tv.switch import HisenseTvSwitch
+
+MESSAGES = 2000
+COMMANDS = 200
+
+CHANNEL_INFOS = [{"list_para": "1", "list_name": "All"}]
+CHANNELS = {
+    "list_para": "1",
+    "list": [
+        {"channel_name": "Channel %d" % num, "channel_num": num, "channel_param": num}
+        for num in range(1, 501)
+    ],
+}
+
+
+@pytest.fixture
+def tv(loop, make_coordinator, broker, add_entity, hass, monkeypatch):
+    """A coordinator that is on, with the three entity classes added."""
+    # measure every state write instead of the rate limit
+    monkeypatch.setattr(helper, "MIN_WRITE_INTERVAL", 0)
+    coordinator = make_coordinator()
+    coordinator.state.is_on = True
+    deliver(loop, broker, coordinator, "sourcelist")
+    deliver(loop, broker, coordinator, "picturesetting")
+    entities = {}
+    for key, entity_class in (
+        ("media_player", HisenseTvEntity),
+        ("switch", HisenseTvSwitch),
+        ("sensor", HisenseTvSensor),
+    ):
+        entities[key] = add_entity(
+            entity_class(
+                hass=hass,
+                coordinator=coordinator,
+                name="TV",
+                mac="02:00:00:00:00:01",
+                uid="tv",
+                ip_address=None,
+            ),
+            "%s.tv" % key,
+        )
+    return coordinator, entities
+
+
+def test_subscriptions_per_tv(make_coordinator, broker, benchmark):
+    make_coordinator()
+    benchmark.count("count.subscriptions_per_tv", broker.subscription_count)
+
+
+def test_handler_throughput(loop, tv, broker, benchmark):
+    """Messages per second of each handler, entities included."""
+    coordinator, _ = tv
+    for key, (name, payload) in SAMPLES.items():
+        msg = broker.encode(coordinator.topics.subscribe[name], payload)
+
+        async def run():
+            for _ in range(MESSAGES):
+                await coordinator._async_dispatch(msg)
+
+        benchmark.time("handler.%s" % key, best_of(loop, run, MESSAGES))
+
+
+def test_unchanged_broadcasts(loop, tv, broker, hass, benchmark):
+    """A repeated broadcast of a TV that is on publishes and writes nothing."""
+    coordinator, _ = tv
+    for key in ("state", "volumechange", "picturesetting_value"):
+        deliver(loop, broker, coordinator, key)
+    broker.published.clear()
+    hass.state_writes.clear()
+    for key in ("state", "volumechange", "picturesetting_value"):
+        deliver(loop, broker, coordinator, key)
+    benchmark.count("count.publishes_per_broadcast", len(broker.published))
+    benchmark.count(
+        "count.state_writes_per_unchanged_broadcast", len(hass.state_writes)
+    )
+
+
+def test_command_to_state_write(loop, tv, broker, hass, benchmark):
+    """Time from a select_source call until the media player writes its state."""
+    coordinator, entities = tv
+    player = entities["media_player"]
+    sources = ["HDMI1", "HDMI2"]
+
+    def confirm(payload):
+        source = json.loads(payload)
+        return (
+            coordinator.topics.subscribe["state"],
+            {
+                "statetype": "sourceswitch",
+                "sourceid": source["sourceid"],
+                "sourcename": source["sourcename"],
+                "displayname": source["sourcename"],
+            },
+        )
+
+    broker.respond(coordinator.topics.publish["changesource"], confirm)
+
+    async def run():
+        for index in range(COMMANDS):
+            written = hass.async_next_write()
+            await player.async_select_source(sources[index % 2])
+            while await written is not player:
+                written = hass.async_next_write()
+
+    benchmark.time("latency.command_to_state_write", best_of(loop, run, COMMANDS))
+
+
+def test_browse_latency(loop, tv, broker, benchmark):
+    """Browsing a channel list page, fetched from the TV and from the cache."""
+    coordinator, entities = tv
+    player = entities["media_player"]
+    replies = {
+        "getchannellistinfo": json.dumps(CHANNEL_INFOS),
+        "channellist": json.dumps(CHANNELS),
+    }
+    for name, reply in replies.items():
+        broker.respond(
+            coordinator.topics.publish[name],
+            lambda payload, name=name, reply=reply: (
+                coordinator.topics.subscribe[name],
+                reply,
+            ),
+        )
+    browses = 100
+
+    async def browse():
+        node = await player.async_browse_media("channellistinfo", "1")
+        assert len(node.children) == 5
+        node = await player.async_browse_media("channellistpage", "1/2")
+        assert len(node.children) == 100
+
+    async def cold():
+        for _ in range(browses):
+            coordinator.cache._entries.clear()
+            await browse()
+
+    async def cached():
+        for _ in range(browses):
+            await browse()
+
+    broker.published.clear()
+    loop.run_until_complete(cold())
+    benchmark.count("count.requests_per_cold_browse", len(broker.published) / browses)
+    benchmark.time("latency.browse_cold", best_of(loop, cold, browses))
+    benchmark.time("latency.browse_cached", best_of(loop, cached, browses))
+
+
+def test_request_round_trip(loop, make_coordinator, broker, benchmark):
+    """Round trip of one request through the fake broker."""
+    coordinator = make_coordinator()
+    reply = json.dumps(
+        [{"appId": str(i), "name": "App %d" % i, "url": "app%d" % i} for i in range(20)]
+    )
+    broker.respond(
+        coordinator.topics.publish["applist"],
+        lambda payload: (coordinator.topics.subscribe["applist"], reply),
+    )
+    requests = 500
+
+    async def run():
+        for _ in range(requests):
+            apps = await coordinator._async_fetch_app_list()
+            assert len(apps) == 20
+
+    benchmark.time("latency.request_round_trip", best_of(loop, run, requests))
+
+
+def test_entity_write_on_change(loop, tv, broker, hass):
+    """Only the entity whose state changed is written."""
+    coordinator, _ = tv
+    deliver(loop, broker, coordinator, "volumechange")
+    hass.state_writes.clear()
+    deliver(
+        loop, broker, coordinator, "volumechange", {"volume_type": 0, "volume_value": 7}
+    )
+    loop.run_until_complete(asyncio.sleep(0))
+    assert {entity_id for entity_id, _ in hass.state_writes} == {"media_player.tv"}
+
+
+def _untyped_state(payload):
+    # how the handlers read a state broadcast before the typed decoder
+    try:
+        data = json.loads(payload.decode())
+    except ValueError:
+        data = {}
+    return (
+        data.get("statetype"),
+        data.get("sourcename"),
+        data.get("sourceid"),
+        data.get("displayname"),
+        data.get("progname"),
+        data.get("channel_name"),
+        data.get("channel_num"),
+        data.get("name"),
+        data.get("url"),
+    )
+
+
+def test_typed_decoder(benchmark):
+    """CPU time and peak allocation of decode_state against untyped decoding."""
+    raw = json.dumps(SAMPLES["state"][1]).encode("utf-8")
+    count = 20000
+
+    def cpu(*funcs):
+        # alternate the rounds so both see the same machine load
+        best = [None] * len(funcs)
+        for _ in range(7):
+            for index, func in enumerate(funcs):
+                started = perf_counter()
+                for _ in range(count):
+                    func(raw)
+                elapsed = (perf_counter() - started) / count
+                if best[index] is None or elapsed < best[index]:
+                    best[index] = elapsed
+        return best
+
+    def peak(func):
+        tracemalloc.start()
+        for _ in range(count):
+            func(raw)
+        _, allocated = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return allocated
+
+    typed, untyped = cpu(decode_state, _untyped_state)
+    benchmark.time("decode.state", typed)
+    benchmark.check("decode.state_vs_untyped", typed / untyped, "ratio", 1.5)
+    benchmark.check(
+        "decode.state_peak_alloc_vs_untyped",
+        peak(decode_state) / peak(_untyped_state),
+        "ratio",
+        1.5,
+    )
@@ -0,0 +1,130 @@
+"""Browse data cache."""
+import asyncio
+
+from custom_components.hisense_tv.cache import HisenseTvCache
+
+
+class Fetch:
+    """A fetch that returns the next value once released."""
+
+    def __init__(self, *values):
+        self._values = list(values)
+        self.calls = 0
+        self.release = asyncio.Event()
+        self.release.set()
+
+    async def __call__(self):
+        self.calls += 1
+        await self.release.wait()
+        return self._values.pop(0)
+
+
+def test_miss_then_hit(loop, hass):
+    cache = HisenseTvCache(hass, 60)
+    fetch = Fetch("a")
+    assert loop.run_until_complete(cache.async_get("key", fetch)) == "a"
+    assert loop.run_until_complete(cache.async_get("key", fetch)) == "a"
+    assert fetch.calls == 1
+    assert cache.stats == {"hits": 1, "misses": 1, "size": 1, "inflight": 0}
+
+
+def test_failed_fetch_is_not_stored(loop, hass):
+    cache = HisenseTvCache(hass, 60)
+    fetch = Fetch(None, "a")
+    assert loop.run_until_complete(cache.async_get("key", fetch)) is None
+    assert cache.peek("key") is None
+    assert loop.run_until_complete(cache.async_get("key", fetch)) == "a"
+
+
+def test_stale_value_served_while_revalidating(loop, hass):
+    updates = []
+    cache = HisenseTvCache(hass, 60, on_update=lambda: updates.append(1))
+    fetch = Fetch("old", "new")
+    loop.run_until_complete(cache.async_get("key", fetch))
+    cache.async_expire("key")
+    assert not cache.is_fresh("key")
+    fetch.release.clear()
+    # answered from the stale entry without waiting for the refresh
+    assert loop.run_until_complete(cache.async_get("key", fetch)) == "old"
+    assert fetch.calls == 2
+    fetch.release.set()
+    loop.run_until_complete(asyncio.sleep(0))
+    assert cache.peek("key") == "new"
+    assert cache.is_fresh("key")
+    assert len(updates) == 2
+
+
+def test_expire_by_prefix(loop, hass):
+    cache = HisenseTvCache(hass, 60)
+    for key in ("channellist/1", "channellist/2", "applist"):
+        loop.run_until_complete(cache.async_get(key, Fetch(key)))
+    cache.async_expire("channellist/")
+    assert not cache.is_fresh("channellist/1")
+    assert not cache.is_fresh("channellist/2")
+    assert cache.is_fresh("applist")
+    # expired values stay available
+    assert cache.peek("channellist/1") == "channellist/1"
+
+
+def test_restored_values_are_stale(loop, hass):
+    cache = HisenseTvCache(hass, 60)
+    cache.async_restore({"applist": "saved"})
+    assert cache.peek("applist") == "saved"
+    assert not cache.is_fresh("applist")
+
+
+def test_concurrent_misses_share_one_fetch(loop, hass):
+    cache = HisenseTvCache(hass, 60)
+    fetch = Fetch("a")
+    fetch.release.clear()
+
+    async def run():
+        readers = [
+            loop.create_task(cache.async_get("key", fetch)),
+            loop.create_task(cache.async_get("key", fetch)),
+            loop.create_task(cache.async_refresh("key", fetch)),
+        ]
+        await asyncio.sleep(0)
+        assert cache.stats["inflight"] == 1
+        fetch.release.set()
+        return await asyncio.gather(*readers)
+
+    assert loop.run_until_complete(run()) == ["a", "a", "a"]
+    assert fetch.calls == 1
+    assert cache.stats["inflight"] == 0
+
+
+def test_refresh_joins_background_revalidation(loop, hass):
+    cache = HisenseTvCache(hass, 60)
+    fetch = Fetch("old", "new")
+    loop.run_until_complete(cache.async_get("key", fetch))
+    cache.async_expire("key")
+    fetch.release.clear()
+
+    async def run():
+        assert await cache.async_get("key", fetch) == "old"
+        refresh = loop.create_task(cache.async_refresh("key", fetch))
+        await asyncio.sleep(0)
+        fetch.release.set()
+        return await refresh
+
+    assert loop.run_until_complete(run()) == "new"
+    assert fetch.calls == 2
+
+
+def test_cancelled_reader_does_not_abort_fetch(loop, hass):
+    cache = HisenseTvCache(hass, 60)
+    fetch = Fetch("a")
+    fetch.release.clear()
+
+    async def run():
+        first = loop.create_task(cache.async_get("key", fetch))
+        second = loop.create_task(cache.async_get("key", fetch))
+        await asyncio.sleep(0)
+        first.cancel()
+        fetch.release.set()
+        return await second
+
+    assert loop.run_until_complete(run()) == "a"
+    assert cache.peek("key") == "a"
+    assert fetch.calls == 1
@@ -0,0 +1,60 @@
+"""Capture replay."""
+import asyncio
+import json
+import os
+
+from conftest import SAMPLES, FakeEntry, payload_text
+from homeassistant.exceptions import HomeAssistantError
+import pytest
+
+from custom_components.hisense_tv import capture
+from custom_components.hisense_tv.capture import async_replay, capture_path
+from custom_components.hisense_tv.coordinator import HisenseTvCoordinator
+
+
+@pytest.mark.parametrize(
+    "file", ["../hisense_tv_capture_tv.jsonl", "/etc/passwd", "secrets.yaml"]
+)
+def test_capture_path_rejects(hass, file):
+    with pytest.raises(HomeAssistantError):
+        capture_path(hass, file)
+
+
+def test_capture_path_allows(hass, tmp_path):
+    assert capture_path(hass, "hisense_tv_capture_tv.jsonl") == os.path.realpath(
+        hass.config.path("hisense_tv_capture_tv.jsonl")
+    )
+    allowed = tmp_path / "captures"
+    allowed.mkdir()
+    hass.config.allowlist_external_dirs.add(os.path.realpath(allowed))
+    assert capture_path(hass, str(allowed / "tv.jsonl")) == os.path.realpath(
+        allowed / "tv.jsonl"
+    )
+
+
+def test_replay_is_isolated(loop, hass, broker, make_coordinator, monkeypatch):
+    monkeypatch.setattr(capture, "REPLAY_BATCH", 2)
+    live = make_coordinator()
+    path = hass.config.path("hisense_tv_capture_tv.jsonl")
+    with open(path, "w", encoding="utf-8") as file:
+        for index, key in enumerate(["state", "volumechange", "sourcelist"]):
+            name, payload = SAMPLES[key]
+            record = {
+                "ts": index,
+                "name": name,
+                "topic": live.topics.subscribe[name],
+                "retain": False,
+                "payload": payload_text(payload),
+            }
+            file.write(json.dumps(record) + "\n")
+    replay = HisenseTvCoordinator(
+        hass=hass, entry=FakeEntry("tv", "hisense", "hisense"), replay=True
+    )
+    count, _ = loop.run_until_complete(async_replay(hass, replay, path, speed=0))
+    loop.run_until_complete(asyncio.sleep(0.01))
+    replay.async_stop()
+    assert count == 3
+    assert replay.state.is_on
+    assert replay.state.volume == 20
+    assert not live.state.is_on
+    assert not broker.published
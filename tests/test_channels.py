@@ -0,0 +1,228 @@
+"""Channel lists, lookup and playback."""
+import json
+
+from homeassistant.exceptions import HomeAssistantError
+import pytest
+
+from custom_components.hisense_tv.channels import ChannelList
+from custom_components.hisense_tv.coordinator import CACHE_CHANNEL_LIST
+from custom_components.hisense_tv.media_player import HisenseTvEntity
+
+CHANNEL_INFOS = [
+    {"list_para": "1", "list_name": "All"},
+    {"list_para": "2", "list_name": "Favourites"},
+]
+CHANNELS = [
+    {"channel_name": "BBC One", "channel_num": 101, "channel_param": "1:101"},
+    {"channel_name": "BBC Two", "channel_num": 102, "channel_param": "1:102"},
+]
+
+
+def _line_up(count):
+    return [
+        {
+            "channel_name": "Channel %d" % num,
+            "channel_num": num,
+            "channel_param": "1:%d" % num,
+        }
+        for num in range(1, count + 1)
+    ]
+
+
+@pytest.fixture
+def line_up():
+    return CHANNELS
+
+
+@pytest.fixture
+def tv(make_coordinator, broker, line_up):
+    """A coordinator whose TV answers channel list requests."""
+    coordinator = make_coordinator()
+    requests = []
+
+    def channel_list(payload):
+        requests.append(json.loads(payload)["list_para"])
+        return coordinator.topics.subscribe["channellist"], {"list": line_up}
+
+    broker.respond(
+        coordinator.topics.publish["getchannellistinfo"],
+        lambda payload: (
+            coordinator.topics.subscribe["getchannellistinfo"],
+            CHANNEL_INFOS,
+        ),
+    )
+    broker.respond(coordinator.topics.publish["channellist"], channel_list)
+    return coordinator, requests
+
+
+def _changed_to(broker, coordinator):
+    topic = coordinator.topics.publish["changechannel"]
+    return [
+        json.loads(payload)["channel_param"]
+        for published, payload in broker.published
+        if published == topic
+    ]
+
+
+def test_play_channel_by_name(loop, tv, broker):
+    coordinator, requests = tv
+    loop.run_until_complete(coordinator.async_play_channel("bbc two"))
+    loop.run_until_complete(coordinator.async_play_channel("102"))
+    assert _changed_to(broker, coordinator) == ["1:102", "1:102"]
+    # the second query is served from the cached list
+    assert requests == ["1"]
+
+
+def test_unknown_channel_refreshes_one_list(loop, tv, broker):
+    coordinator, requests = tv
+    for _ in range(2):
+        with pytest.raises(HomeAssistantError):
+            loop.run_until_complete(coordinator.async_play_channel("CNN"))
+    # one refresh of the first list per unknown query, never every list
+    assert requests == ["1", "1"]
+    assert not _changed_to(broker, coordinator)
+
+
+def test_unknown_param_is_passed_through(loop, tv, broker):
+    coordinator, _ = tv
+    loop.run_until_complete(coordinator.async_play_channel("2:7"))
+    assert _changed_to(broker, coordinator) == ["2:7"]
+
+
+def test_pages():
+    channels = ChannelList(_line_up(250))
+    assert channels.pages == 3
+    assert channels.page(0) == range(0, 100)
+    assert channels.page(2) == range(200, 250)
+    assert [channels.page_title(page) for page in range(3)] == [
+        "1 - 100",
+        "101 - 200",
+        "201 - 250",
+    ]
+    assert not channels.page(3)
+    assert channels.page_title(3) == "4"
+
+
+def test_page_title_without_channel_numbers():
+    channels = ChannelList(
+        [{"channel_name": "Radio", "channel_param": "r:%d" % i} for i in range(150)]
+    )
+    assert channels.pages == 2
+    assert channels.page_title(1) == "101 - 150"
+
+
+def test_small_list_is_one_page():
+    assert ChannelList(_line_up(100)).pages == 1
+    assert ChannelList([]).pages == 0
+
+
+def test_compact_list_reused_until_refetched(loop, tv):
+    coordinator, requests = tv
+    first = loop.run_until_complete(coordinator.async_get_channels("1"))
+    assert loop.run_until_complete(coordinator.async_get_channels("1")) is first
+    coordinator.cache.async_invalidate(CACHE_CHANNEL_LIST % "1")
+    second = loop.run_until_complete(coordinator.async_get_channels("1"))
+    assert second is not first
+    assert second.params == first.params
+    assert requests == ["1", "1"]
+
+
+@pytest.mark.parametrize("line_up", [_line_up(250)])
+def test_browse_large_list_by_page(loop, tv, hass, add_entity):
+    coordinator, requests = tv
+    player = add_entity(
+        HisenseTvEntity(
+            hass=hass,
+            coordinator=coordinator,
+            name="TV",
+            mac="02:00:00:00:00:01",
+            uid="tv",
+            ip_address=None,
+        ),
+        "media_player.tv",
+    )
+    node = loop.run_until_complete(player.async_browse_media("channellistinfo", "1"))
+    assert [child.title for child in node.children] == [
+        "1 - 100",
+        "101 - 200",
+        "201 - 250",
+    ]
+    assert [child.media_content_id for child in node.children] == ["1/0", "1/1", "1/2"]
+    page = loop.run_until_complete(player.async_browse_media("channellistpage", "1/2"))
+    assert page.title == "201 - 250"
+    assert len(page.children) == 50
+    assert page.children[0].title == "Channel 201"
+    assert page.children[0].media_content_id == "1:201"
+    # pages are built from the cached list
+    assert requests == ["1"]
+
+
+LOOKUP = [
+    {"channel_name": "BBC One", "channel_num": 101, "channel_param": "1:101"},
+    {"channel_name": "BBC Two", "channel_num": 102, "channel_param": "1:102"},
+    {"channel_name": "BBC News", "channel_num": 7, "channel_param": "1:107"},
+    {"channel_name": "Arte", "channel_num": 8, "channel_param": "7"},
+    {"channel_name": "bbc one", "channel_num": 201, "channel_param": "1:201"},
+]
+
+
+def test_find_by_param_number_and_name():
+    channels = ChannelList(LOOKUP)
+    assert channels.find("1:102") == 1
+    assert channels.find(" 102 ") == 1
+    assert channels.find(102) == 1
+    # names ignore case, spaces and punctuation, the first duplicate wins
+    assert channels.find("bbc-one") == 0
+    assert channels.find("Unknown") is None
+    assert channels.find("") is None
+
+
+def test_param_wins_over_number():
+    # "7" is the param of Arte and the number of BBC News
+    assert ChannelList(LOOKUP).find("7") == 3
+
+
+def test_prefix_only_on_request():
+    channels = ChannelList(LOOKUP)
+    assert channels.find("BBC N") is None
+    assert channels.find("BBC N", prefix=True) == 2
+    # the first name in sorted order
+    assert channels.find("bbc", prefix=True) == 2
+
+
+def test_search_by_prefix():
+    channels = ChannelList(LOOKUP)
+    # sorted by normalised name: bbcnews, bbcone, bbctwo
+    assert channels.search("bbc") == [2, 0, 1]
+    assert channels.search("BBC", limit=2) == [2, 0]
+    assert channels.search("bbc t") == [1]
+    assert channels.search("zdf") == []
+    assert channels.search(" ") == []
+
+
+def test_exact_match_in_any_list_before_prefix(loop, make_coordinator, broker):
+    coordinator = make_coordinator()
+    lists = {
+        "1": [{"channel_name": "Sport 1 HD", "channel_param": "1:1"}],
+        "2": [{"channel_name": "Sport", "channel_param": "2:1"}],
+    }
+    broker.respond(
+        coordinator.topics.publish["getchannellistinfo"],
+        lambda payload: (
+            coordinator.topics.subscribe["getchannellistinfo"],
+            [{"list_para": para, "list_name": para} for para in lists],
+        ),
+    )
+    broker.respond(
+        coordinator.topics.publish["channellist"],
+        lambda payload: (
+            coordinator.topics.subscribe["channellist"],
+            {"list": lists[json.loads(payload)["list_para"]]},
+        ),
+    )
+    for list_para in lists:
+        loop.run_until_complete(coordinator.async_get_channels(list_para))
+    channels, index = loop.run_until_complete(coordinator.async_find_channel("sport"))
+    assert channels.params[index] == "2:1"
+    results = loop.run_until_complete(coordinator.async_search_channels("sport"))
+    assert [channels.params[index] for channels, index in results] == ["2:1", "1:1"]
@@ -0,0 +1,48 @@
+"""Command serialization."""
+import asyncio
+
+from conftest import SAMPLES
+
+
+def test_commands_do_not_interleave_key_sequences(loop, make_coordinator, broker):
+    coordinator = make_coordinator(volume_debounce=0)
+    coordinator.state.source_list = {"HDMI1": {"sourceid": "2", "sourcename": "HDMI1"}}
+
+    async def run():
+        keys = loop.create_task(
+            coordinator.async_send_keys(["KEY_1", "KEY_2", "KEY_3"], delay_secs=0.02)
+        )
+        await asyncio.sleep(0)
+        coordinator.async_set_volume(30)
+        await coordinator.async_select_source("HDMI1")
+        await coordinator.async_launch_app("1", "App", "app")
+        await keys
+        await asyncio.sleep(0.01)
+
+    loop.run_until_complete(run())
+    names = {topic: name for name, topic in coordinator.topics.publish.items()}
+    published = [names[topic] for topic, _ in broker.published]
+    assert published[:3] == ["sendkey"] * 3
+    assert sorted(published[3:]) == ["changesource", "changevolume", "launchapp"]
+
+
+def test_acks_recorded_without_instrumentation(loop, make_coordinator, broker):
+    coordinator = make_coordinator()
+    assert coordinator.stats is None
+    coordinator.state.source_list = {"HDMI1": {"sourceid": "2", "sourcename": "HDMI1"}}
+    coordinator.acks._timeout = 0.01
+
+    async def run():
+        ack = await coordinator.async_select_source("HDMI1")
+        name, payload = SAMPLES["state_sourceswitch"]
+        await broker.async_deliver(coordinator.topics.subscribe[name], payload)
+        assert await ack is not None
+        ack = await coordinator.async_launch_app("1", "App", "app")
+        # never confirmed
+        assert await ack is None
+
+    loop.run_until_complete(run())
+    stats = coordinator.acks.stats
+    assert stats["last"] == stats["last_by_command"]["changesource"]
+    assert stats["recent_max"] == stats["last"]
+    assert stats["timeouts"] == {"launchapp": 1}
@@ -0,0 +1,41 @@
+"""Diagnostics."""
+from conftest import FakeEntry
+
+from custom_components.hisense_tv.diagnostics import async_get_config_entry_diagnostics
+from custom_components.hisense_tv.helper import HisenseTvBase
+
+
+class Entity(HisenseTvBase):
+    entity_id = "sensor.tv"
+    unique_id = "tv_sensor"
+    available = True
+    state = "on"
+    capability_attributes = None
+    state_attributes = None
+    extra_state_attributes = None
+
+    def __init__(self, hass, coordinator):
+        HisenseTvBase.__init__(
+            self, hass, coordinator, "TV", "02:00:00:00:00:01", "tv", None
+        )
+        self.writes = 0
+
+    def async_write_ha_state(self):
+        self.writes += 1
+
+
+def test_entity_write_counters(loop, hass, make_coordinator):
+    coordinator = make_coordinator()
+    entity = Entity(hass, coordinator)
+    entity._async_write_state_throttled()
+    entity._async_write_state_throttled()
+    entity._async_cancel_write()
+    entity._last_write = 0
+    entity._async_write_state_throttled()
+    diagnostics = loop.run_until_complete(
+        async_get_config_entry_diagnostics(hass, FakeEntry("tv", "hisense", "hisense"))
+    )
+    assert diagnostics["entity_writes"] == {
+        "sensor.tv": {"written": 1, "unchanged": 1, "throttled": 1}
+    }
+    assert entity.writes == 1
@@ -0,0 +1,106 @@
+"""Fleet mode scaling and routing."""
+from conftest import SAMPLES, Message, best_of, deliver, payload_text
+
+from custom_components.hisense_tv.fleet import TopicTrie, async_get_fleet
+
+FLEET_SIZE = 200
+MESSAGES = 2000
+
+
+def _make_fleet(make_coordinator, start, stop, fleet_mode=True):
+    return [
+        make_coordinator(
+            entry_id="tv%d" % index, mqtt_in="tv%d" % index, fleet_mode=fleet_mode
+        )
+        for index in range(start, stop)
+    ]
+
+
+def _dispatch_cost(loop, hass, coordinators):
+    """Return the best fleet routing time per state message in seconds."""
+    fleet = async_get_fleet(hass)
+    name, payload = SAMPLES["state"]
+    payload = payload_text(payload)
+    messages = [
+        Message(
+            coordinators[index % len(coordinators)].topics.subscribe[name], payload
+        )
+        for index in range(MESSAGES)
+    ]
+
+    async def run():
+        for msg in messages:
+            await fleet._async_message_received(msg)
+
+    return best_of(loop, run, MESSAGES)
+
+
+def test_subscriptions(make_coordinator, broker, benchmark):
+    """One broker subscription per TV in fleet mode instead of one per topic."""
+    _make_fleet(make_coordinator, 0, FLEET_SIZE)
+    assert broker.subscription_count == FLEET_SIZE
+    benchmark.count("count.fleet_subscriptions_200_tvs", broker.subscription_count)
+
+
+def test_subscriptions_without_fleet_mode(make_coordinator, broker, benchmark):
+    _make_fleet(make_coordinator, 0, FLEET_SIZE, fleet_mode=False)
+    benchmark.count("count.subscriptions_200_tvs", broker.subscription_count)
+
+
+def test_dispatch_cost(loop, hass, make_coordinator, benchmark):
+    """Routing cost per message does not grow with the number of TVs."""
+    coordinators = _make_fleet(make_coordinator, 0, 10)
+    for coordinator in coordinators:
+        coordinator.state.is_on = True
+    small = _dispatch_cost(loop, hass, coordinators)
+    coordinators.extend(_make_fleet(make_coordinator, 10, FLEET_SIZE))
+    for coordinator in coordinators:
+        coordinator.state.is_on = True
+    large = _dispatch_cost(loop, hass, coordinators)
+    benchmark.time("fleet.dispatch_200_tvs", large)
+    # relative to 10 TVs measured in the same run, about 1 if routing is O(1)
+    benchmark.check("fleet.dispatch_200_vs_10_tvs", large / small, "ratio", 2.0)
+
+
+def test_dispatch_reaches_tv(loop, make_coordinator, broker):
+    coordinators = _make_fleet(make_coordinator, 0, 3)
+    deliver(loop, broker, coordinators[1], "volumechange")
+    assert coordinators[1].state.volume == 20
+    assert coordinators[0].state.volume != 20
+    assert coordinators[2].state.volume != 20
+
+
+def test_shared_prefix(loop, make_coordinator, broker):
+    """Two TVs on one prefix both receive messages, before and after an unload."""
+    first = make_coordinator(entry_id="first", mqtt_in="shared", fleet_mode=True)
+    second = make_coordinator(entry_id="second", mqtt_in="shared", fleet_mode=True)
+    assert broker.subscription_count == 1
+    deliver(loop, broker, first, "volumechange")
+    assert first.state.volume == 20
+    assert second.state.volume == 20
+
+    first.async_stop()
+    assert broker.subscription_count == 1
+    deliver(
+        loop, broker, second, "volumechange", {"volume_type": 0, "volume_value": 30}
+    )
+    assert second.state.volume == 30
+    assert first.state.volume == 20
+
+
+def test_trie_shared_filter():
+    trie = TopicTrie()
+    wildcard = object()
+    trie.add("a/+/c", wildcard)
+    trie.add("a/b/c", "first")
+    trie.add("a/b/c", "second")
+    assert len(trie) == 2
+    assert trie.match("a/b/c") == ("first", "second")
+    trie.remove("a/b/c", "first")
+    assert trie.match("a/b/c") == ("second",)
+    trie.remove("a/b/c", "second")
+    assert len(trie) == 1
+    assert trie.match("a/b/c") == (wildcard,)
+    trie.remove("a/+/c", wildcard)
+    assert len(trie) == 0
+    assert trie.match("a/b/c") == ()
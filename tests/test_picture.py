@@ -0,0 +1,41 @@
+"""Picture setting entities."""
+import json
+
+from custom_components.hisense_tv.decode import decode_picture_settings
+from custom_components.hisense_tv.number import HisenseTvPictureNumber
+from custom_components.hisense_tv.select import HisenseTvPictureSelect
+from custom_components.hisense_tv.sensor import HisenseTvPictureSensor
+
+SETTINGS = decode_picture_settings(
+    json.dumps(
+        {
+            "menu_info": [
+                {"menu_id": 91, "menu_name": "Backlight", "menu_value": 50},
+                {
+                    "menu_id": 92,
+                    "menu_name": "Picture mode",
+                    "menu_value": "Standard",
+                    "menu_para": ["Standard", "Vivid"],
+                },
+                {"menu_id": 93, "menu_name": "Resolution", "menu_value": "4K"},
+            ]
+        }
+    )
+)
+
+
+def test_one_entity_per_setting():
+    entity_classes = (
+        HisenseTvPictureNumber,
+        HisenseTvPictureSelect,
+        HisenseTvPictureSensor,
+    )
+    covered = {
+        menu_id: [cls for cls in entity_classes if cls.supports(setting)]
+        for menu_id, setting in SETTINGS.items()
+    }
+    assert covered == {
+        91: [HisenseTvPictureNumber],
+        92: [HisenseTvPictureSelect],
+        93: [HisenseTvPictureSensor],
+    }
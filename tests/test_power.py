@@ -0,0 +1,103 @@
+"""Power state transitions and Wake-on-LAN."""
+import asyncio
+
+from conftest import SAMPLES, deliver
+import pytest
+
+from custom_components.hisense_tv import coordinator as coordinator_module
+
+
+@pytest.fixture
+def packets(monkeypatch):
+    sent = []
+
+    async def send_magic_packet(mac, addresses, burst=3):
+        sent.append(mac)
+
+    monkeypatch.setattr(
+        coordinator_module, "async_send_magic_packet", send_magic_packet
+    )
+    monkeypatch.setattr(coordinator_module, "WOL_RETRY_DELAY", 0.01)
+    return sent
+
+
+@pytest.mark.parametrize(
+    "key", ["volumechange", "sourcelist", "picturesetting", "picturesetting_value"]
+)
+def test_any_message_confirms_power_on(loop, make_coordinator, broker, packets, key):
+    coordinator = make_coordinator()
+
+    async def wake():
+        task = loop.create_task(coordinator.async_turn_on())
+        await asyncio.sleep(0)
+        name, payload = SAMPLES[key]
+        await broker.async_deliver(coordinator.topics.subscribe[name], payload)
+        await task
+
+    loop.run_until_complete(wake())
+    assert coordinator.state.is_on
+    assert packets
+
+
+def test_already_on_tv_answers_getvolume(loop, make_coordinator, broker, packets):
+    coordinator = make_coordinator()
+    name, payload = SAMPLES["volumechange"]
+    broker.respond(
+        coordinator.topics.publish["getvolume"],
+        lambda _: (coordinator.topics.subscribe[name], payload),
+    )
+    loop.run_until_complete(coordinator.async_turn_on())
+    assert coordinator.state.is_on
+    assert len(packets) == 1
+
+
+def test_stale_on_state_waits_for_the_tv(loop, make_coordinator, broker, packets):
+    coordinator = make_coordinator()
+    coordinator.state.is_on = True
+
+    async def wake():
+        task = loop.create_task(coordinator.async_turn_on())
+        await asyncio.sleep(0.05)
+        # is_on alone does not confirm, the TV has not answered yet
+        assert not task.done()
+        name, payload = SAMPLES["volumechange"]
+        await broker.async_deliver(coordinator.topics.subscribe[name], payload)
+        await task
+
+    loop.run_until_complete(wake())
+    assert len(packets) > 1
+    assert coordinator.topics.publish["getvolume"] in [
+        topic for topic, _ in broker.published
+    ]
+
+
+def test_power_on_work_runs_once(loop, make_coordinator, broker):
+    coordinator = make_coordinator()
+    deliver(loop, broker, coordinator, "volumechange")
+    loop.run_until_complete(asyncio.sleep(0))
+    published = [topic for topic, _ in broker.published]
+    assert published.count(coordinator.topics.publish["getvolume"]) == 1
+    broker.published.clear()
+    deliver(loop, broker, coordinator, "state")
+    assert coordinator.state.is_on
+    assert coordinator.topics.publish["getvolume"] not in [
+        topic for topic, _ in broker.published
+    ]
+
+
+def test_fake_sleep_is_off(loop, make_coordinator, broker):
+    coordinator = make_coordinator()
+    deliver(loop, broker, coordinator, "state", {"statetype": "fake_sleep_0"})
+    assert not coordinator.state.is_on
+    assert not broker.published
+
+
+@pytest.mark.parametrize("key", ["volumechange", "sourcelist", "state"])
+def test_warmup_after_any_first_message(loop, make_coordinator, broker, key):
+    coordinator = make_coordinator()
+    deliver(loop, broker, coordinator, key)
+    loop.run_until_complete(asyncio.sleep(0.01))
+    assert (
+        coordinator.topics.publish["picturesetting"],
+        '{"action": "get_menu_info"}',
+    ) in broker.published
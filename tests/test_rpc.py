@@ -0,0 +1,57 @@
+"""Request/reply matching."""
+import asyncio
+import json
+
+import pytest
+
+
+def test_late_channel_list_reply_is_discarded(loop, make_coordinator, broker):
+    coordinator = make_coordinator()
+    reply_topic = coordinator.topics.subscribe["channellist"]
+    requests = []
+    broker.respond(
+        coordinator.topics.publish["channellist"],
+        lambda payload: requests.append(json.loads(payload)["list_para"]),
+    )
+
+    def reply(list_para):
+        return broker.async_deliver(
+            reply_topic,
+            {
+                "list_para": list_para,
+                "list": [{"channel_name": list_para, "channel_param": list_para}],
+            },
+        )
+
+    async def fetch():
+        # list A times out, its reply arrives while list B is requested
+        with pytest.raises(asyncio.TimeoutError):
+            await coordinator.rpc.async_request(
+                coordinator.topics.publish["channellist"],
+                reply_topic,
+                json.dumps({"list_para": "A", "list_name": "A"}),
+                timeout=0.01,
+            )
+        task = loop.create_task(coordinator._async_fetch_channel_list("B", "B"))
+        await asyncio.sleep(0)
+        await reply("A")
+        assert not task.done()
+        await reply("B")
+        return await task
+
+    channels = loop.run_until_complete(fetch())
+    assert requests == ["A", "B"]
+    assert [channel["channel_param"] for channel in channels] == ["B"]
+
+
+def test_reply_without_list_para_is_accepted(loop, make_coordinator, broker):
+    coordinator = make_coordinator()
+    broker.respond(
+        coordinator.topics.publish["channellist"],
+        lambda payload: (
+            coordinator.topics.subscribe["channellist"],
+            {"list": [{"channel_name": "One", "channel_param": "1"}]},
+        ),
+    )
+    channels = loop.run_until_complete(coordinator._async_fetch_channel_list(1, "A"))
+    assert channels == [{"channel_name": "One", "channel_param": "1"}]
@@ -0,0 +1,45 @@
+"""Volume changes."""
+import asyncio
+
+from conftest import deliver
+
+
+def _published(broker, coordinator, name):
+    topic = coordinator.topics.publish[name]
+    return [payload for published, payload in broker.published if published == topic]
+
+
+def test_step_uses_keys_while_volume_unknown(loop, make_coordinator, broker):
+    coordinator = make_coordinator()
+    assert coordinator.state.volume is None
+    loop.run_until_complete(coordinator.async_step_volume(1))
+    loop.run_until_complete(coordinator.async_step_volume(-1))
+    assert _published(broker, coordinator, "sendkey") == [
+        "KEY_VOLUMEUP",
+        "KEY_VOLUMEDOWN",
+    ]
+    assert coordinator.state.volume is None
+
+
+def test_step_from_known_volume(loop, make_coordinator, broker):
+    coordinator = make_coordinator(volume_debounce=0.01)
+    deliver(loop, broker, coordinator, "volumechange")
+    loop.run_until_complete(coordinator.async_step_volume(1))
+    loop.run_until_complete(asyncio.sleep(0.05))
+    assert _published(broker, coordinator, "changevolume") == [21]
+    assert not _published(broker, coordinator, "sendkey")
+
+
+def test_debounce_restarts_on_each_change(loop, make_coordinator, broker):
+    coordinator = make_coordinator(volume_debounce=0.05)
+
+    async def ramp():
+        for volume in range(10, 16):
+            coordinator.async_set_volume(volume)
+            await asyncio.sleep(0.02)
+        # still changing after more than one debounce window
+        assert not _published(broker, coordinator, "changevolume")
+        await asyncio.sleep(0.1)
+
+    loop.run_until_complete(ramp())
+    assert _published(broker, coordinator, "changevolume") == [15]